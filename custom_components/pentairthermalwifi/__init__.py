@@ -1,20 +1,48 @@
 """The Pentair Thermal WiFi integration."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
 import logging
+import time
 
-from pypentairthermalwifi import AsyncPentairThermalWifi
+from pypentairthermalwifi import (
+    AsyncPentairThermalWifi,
+    AuthenticationError,
+    PentairThermalWifiError,
+)
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
-
-from .const import COORDINATOR, DOMAIN, PLATFORMS
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .api import async_release_client, async_use_shared_http_client
+from .const import (
+    CONF_SESSION_ID,
+    CONNECT_RETRY_INTERVAL,
+    COORDINATOR,
+    DOMAIN,
+    PLATFORMS,
+)
 from .coordinator import PentairThermalWiFiCoordinator
+from .services import async_setup_services
+from .store import async_get_store
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Pentair Thermal WiFi services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Pentair Thermal WiFi from a config entry."""
@@ -25,44 +53,177 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         email=entry.data[CONF_EMAIL],
         password=entry.data[CONF_PASSWORD],
     )
-
-    # Authenticate and verify credentials
-    try:
-        await client.authenticate()
-    except Exception as err:
-        await client.close()
-        raise ConfigEntryAuthFailed(f"Authentication failed: {err}") from err
+    async_use_shared_http_client(hass, client)
 
     # Create and setup coordinator
-    coordinator = PentairThermalWiFiCoordinator(hass, client)
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, client, store=async_get_store(hass, entry.entry_id)
+    )
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
-
-    # Start monitoring for push notifications
-    await coordinator.async_start_monitoring()
+    phases = coordinator.stats.setup_phases
+
+    with _timed_phase(phases, "load_snapshot"):
+        snapshot_loaded = await coordinator.async_load_snapshot()
+
+    if snapshot_loaded:
+        # Create entities from the last known state right away and connect
+        # to the cloud in the background
+        entry.async_create_background_task(
+            hass,
+            _async_connect(hass, entry, coordinator),
+            f"{DOMAIN} connect {entry.entry_id}",
+        )
+    else:
+        # Authenticate and verify credentials
+        with _timed_phase(phases, "authenticate"):
+            try:
+                await _async_authenticate(hass, entry, client)
+            except Exception as err:
+                async_release_client(client)
+                raise ConfigEntryAuthFailed(f"Authentication failed: {err}") from err
+
+        # Fetch initial data
+        with _timed_phase(phases, "first_refresh"):
+            await coordinator.async_config_entry_first_refresh()
+        _async_update_session(hass, entry, client)
 
     # Store coordinator in hass.data
     hass.data[DOMAIN][entry.entry_id] = {
         COORDINATOR: coordinator,
     }
 
+    if not snapshot_loaded:
+        # Subscribe before the platforms are set up, the supervisor starts the
+        # long-poll in the background while the entities are created. Starting
+        # it before the first refresh has completed would make the client
+        # fetch all thermostats a second time.
+        await coordinator.async_start_monitoring()
+
     # Forward entry setup to platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    with _timed_phase(phases, "platforms"):
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    _LOGGER.debug("Setup phases for %s: %s", entry.title, phases)
     return True
 
 
+@contextmanager
+def _timed_phase(phases: dict[str, float], phase: str) -> Iterator[None]:
+    """Record how many seconds a setup phase takes."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        phases[phase] = round(time.monotonic() - started, 3)
+
+
+async def _async_connect(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: PentairThermalWiFiCoordinator,
+) -> None:
+    """Authenticate, fetch live data and start monitoring in the background."""
+    with _timed_phase(coordinator.stats.setup_phases, "connect"):
+        await _async_connect_with_retry(hass, entry, coordinator)
+
+
+async def _async_connect_with_retry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: PentairThermalWiFiCoordinator,
+) -> None:
+    """Connect to the cloud, retrying until the thermostats have been fetched."""
+    while True:
+        try:
+            await _async_authenticate(hass, entry, coordinator.client)
+        except AuthenticationError as err:
+            _LOGGER.error("Authentication failed: %s", err)
+            entry.async_start_reauth(hass)
+            return
+        except PentairThermalWifiError as err:
+            _LOGGER.warning(
+                "Unable to connect, retrying in %s seconds: %s",
+                CONNECT_RETRY_INTERVAL,
+                err,
+            )
+        else:
+            await coordinator.async_refresh()
+            if coordinator.last_update_success:
+                break
+            if isinstance(coordinator.last_exception, ConfigEntryAuthFailed):
+                # The coordinator has started reauthentication
+                return
+            _LOGGER.warning(
+                "Unable to fetch thermostats, retrying in %s seconds",
+                CONNECT_RETRY_INTERVAL,
+            )
+        await asyncio.sleep(CONNECT_RETRY_INTERVAL)
+
+    _async_update_session(hass, entry, coordinator.client)
+    await coordinator.async_start_monitoring()
+
+
+async def _async_authenticate(
+    hass: HomeAssistant, entry: ConfigEntry, client: AsyncPentairThermalWifi
+) -> None:
+    """Reuse the stored session, or log in and store the new session."""
+    if session_id := entry.data.get(CONF_SESSION_ID):
+        # The client has no public way to resume a session. When the cloud
+        # rejects it, the client logs in again on its own and retries.
+        client._session_id = session_id
+        return
+
+    auth = await client.authenticate()
+    _async_update_session(hass, entry, client, auth.session_id)
+
+
+@callback
+def _async_update_session(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    client: AsyncPentairThermalWifi,
+    session_id: str | None = None,
+) -> None:
+    """Store the client's current session in the config entry if it changed."""
+    if session_id is None:
+        session_id = client._session_id
+    if session_id and session_id != entry.data.get(CONF_SESSION_ID):
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_SESSION_ID: session_id}
+        )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        # Stop monitoring and close the client
+        # Stop monitoring and release the client
         coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+        _async_update_session(hass, entry, coordinator.client)
         await coordinator.async_stop_monitoring()
-        await coordinator.client.close()
+        await coordinator.async_shutdown()
+        async_release_client(coordinator.client)
 
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, entry: ConfigEntry, device: dr.DeviceEntry
+) -> bool:
+    """Allow removing a device whose thermostat is no longer in the account."""
+    coordinator: PentairThermalWiFiCoordinator = hass.data[DOMAIN][entry.entry_id][
+        COORDINATOR
+    ]
+    return not any(
+        coordinator.get_thermostat(identifier) is not None
+        for domain, identifier in device.identifiers
+        if domain == DOMAIN
+    )
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted snapshot of a removed config entry."""
+    await async_get_store(hass, entry.entry_id).async_remove()
@@ -0,0 +1,51 @@
+"""API client helpers for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+import httpx
+from pypentairthermalwifi import AsyncPentairThermalWifi
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.httpx_client import create_async_httpx_client
+
+from .const import DOMAIN, HTTP_CLIENT, REQUEST_TIMEOUT
+
+
+@callback
+def async_get_http_client(hass: HomeAssistant) -> httpx.AsyncClient:
+    """Return the HTTP client shared by all config entries and the config flow.
+
+    Home Assistant's default HTTP client times out after 5 seconds, so the
+    integration creates its own with the library's request timeout. It is
+    closed when Home Assistant stops.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if HTTP_CLIENT not in domain_data:
+        domain_data[HTTP_CLIENT] = create_async_httpx_client(
+            hass, timeout=REQUEST_TIMEOUT
+        )
+    return domain_data[HTTP_CLIENT]
+
+
+@callback
+def async_use_shared_http_client(
+    hass: HomeAssistant, client: AsyncPentairThermalWifi
+) -> None:
+    """Make the client send its requests over the shared HTTP client.
+
+    All accounts and the config flow then share one connection pool, so
+    connections to the cloud are kept alive and reused instead of every
+    client doing its own TLS handshakes.
+    """
+    # The client creates its HTTP client lazily and has no public way to pass
+    # one in, so set it before the first request
+    client._client = async_get_http_client(hass)
+
+
+@callback
+def async_release_client(client: AsyncPentairThermalWifi) -> None:
+    """Release a client without closing the shared HTTP client.
+
+    The monitoring supervisor runs the long-polls, so the client holds no
+    other resources that need to be closed.
+    """
+    client._client = None
@@ -1,25 +1,61 @@
 """Binary sensor platform for Pentair Thermal WiFi integration."""
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
+from typing import Any
 
 from pypentairthermalwifi import Thermostat
 
 from homeassistant.components.binary_sensor import (
-    BinarySensorEntity,
     BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import COORDINATOR, DOMAIN
 from .coordinator import PentairThermalWiFiCoordinator
+from .entity import PentairThermalWiFiEntity, async_setup_thermostat_entities
+from .view import ThermostatView
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class PentairThermalWiFiBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a Pentair Thermal WiFi binary sensor."""
+
+    value_fn: Callable[[ThermostatView], bool]
+    available_fn: Callable[[ThermostatView], bool] = lambda view: view.online
+
+
+BINARY_SENSORS: tuple[PentairThermalWiFiBinarySensorEntityDescription, ...] = (
+    PentairThermalWiFiBinarySensorEntityDescription(
+        key="heating",
+        name="Heating",
+        device_class=BinarySensorDeviceClass.HEAT,
+        value_fn=lambda view: view.heating,
+    ),
+    PentairThermalWiFiBinarySensorEntityDescription(
+        key="connectivity",
+        name="Connectivity",
+        device_class=BinarySensorDeviceClass.CONNECTIVITY,
+        value_fn=lambda view: view.online,
+        # Reports the thermostat going offline instead of becoming unavailable
+        available_fn=lambda view: True,
+    ),
+    PentairThermalWiFiBinarySensorEntityDescription(
+        key="vacation",
+        name="Vacation",
+        value_fn=lambda view: view.vacation,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -31,99 +67,43 @@ async def async_setup_entry(
     ]
 
     # Create binary sensors for each thermostat
-    entities = []
-    for thermostat in coordinator.data.get_all_thermostats():
-        entities.extend([
-            PentairThermalWiFiHeatingSensor(coordinator, thermostat),
-            PentairThermalWiFiConnectivitySensor(coordinator, thermostat),
-        ])
-
-    async_add_entities(entities)
+    async_setup_thermostat_entities(
+        coordinator,
+        entry,
+        async_add_entities,
+        lambda thermostat: (
+            PentairThermalWiFiBinarySensor(coordinator, thermostat, description)
+            for description in BINARY_SENSORS
+        ),
+    )
 
 
-class PentairThermalWiFiBinarySensorBase(CoordinatorEntity, BinarySensorEntity):
-    """Base class for Pentair Thermal WiFi binary sensors."""
+class PentairThermalWiFiBinarySensor(PentairThermalWiFiEntity, BinarySensorEntity):
+    """Binary sensor for a field of a Pentair Thermal WiFi thermostat."""
 
-    _attr_has_entity_name = True
+    entity_description: PentairThermalWiFiBinarySensorEntityDescription
 
     def __init__(
         self,
         coordinator: PentairThermalWiFiCoordinator,
         thermostat: Thermostat,
-        sensor_type: str,
-        device_class: BinarySensorDeviceClass | None = None,
+        description: PentairThermalWiFiBinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._serial_number = thermostat.serial_number
-        self._sensor_type = sensor_type
-        self._attr_unique_id = f"{thermostat.serial_number}_{sensor_type}"
-        self._attr_device_class = device_class
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, thermostat.serial_number)},
-            "name": thermostat.room,
-            "manufacturer": "Pentair Thermal",
-            "model": "Senz WiFi",
-            "sw_version": thermostat.sw_version,
-        }
-
-    @property
-    def _thermostat(self) -> Thermostat | None:
-        """Get the current thermostat data from coordinator."""
-        return self.coordinator.data.get_thermostat(self._serial_number)
-
-
-class PentairThermalWiFiHeatingSensor(PentairThermalWiFiBinarySensorBase):
-    """Binary sensor for heating status."""
-
-    _attr_name = "Heating"
-    _attr_device_class = BinarySensorDeviceClass.HEAT
-
-    def __init__(
-        self,
-        coordinator: PentairThermalWiFiCoordinator,
-        thermostat: Thermostat,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator, thermostat, "heating", BinarySensorDeviceClass.HEAT
-        )
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        if not super().available:
-            return False
-        thermostat = self._thermostat
-        return thermostat is not None and thermostat.online
-
-    @property
-    def is_on(self) -> bool | None:
-        """Return true if heating is active."""
-        if thermostat := self._thermostat:
-            return thermostat.heating
-        return None
+        super().__init__(coordinator, thermostat, description.key)
+        self.entity_description = description
 
+    def _view_available(self, view: ThermostatView) -> bool:
+        """Return if the thermostat state makes this entity available."""
+        return self.entity_description.available_fn(view)
 
-class PentairThermalWiFiConnectivitySensor(PentairThermalWiFiBinarySensorBase):
-    """Binary sensor for connectivity status."""
-
-    _attr_name = "Connectivity"
-    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
-
-    def __init__(
-        self,
-        coordinator: PentairThermalWiFiCoordinator,
-        thermostat: Thermostat,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator, thermostat, "connectivity", BinarySensorDeviceClass.CONNECTIVITY
-        )
+    def _view_fingerprint(self, view: ThermostatView) -> Any:
+        """Return the view fields that determine this entity's state."""
+        return self.entity_description.value_fn(view)
 
     @property
     def is_on(self) -> bool | None:
-        """Return true if device is online."""
-        if thermostat := self._thermostat:
-            return thermostat.online
+        """Return true if the binary sensor is on."""
+        if view := self._view:
+            return self.entity_description.value_fn(view)
         return None
@@ -0,0 +1,101 @@
+"""Per-thermostat command queue for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _QueuedCommand:
+    """A command waiting to be sent to a thermostat."""
+
+    command: Callable[[], Awaitable[Any]]
+    merge_key: str | None
+    future: asyncio.Future[None]
+
+
+class ThermostatCommandQueue:
+    """Send the commands for one thermostat one at a time, in order.
+
+    A queued command is replaced by a newer command with the same merge key
+    when it is the last one in the queue, so only the final value of a burst
+    of setpoint changes is sent. Commands without a merge key are never merged
+    and keep their position relative to the other commands.
+    """
+
+    def __init__(self, hass: HomeAssistant, serial_number: str) -> None:
+        """Initialize the command queue."""
+        self.hass = hass
+        self.serial_number = serial_number
+        self._queue: deque[_QueuedCommand] = deque()
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_enqueue(
+        self,
+        command: Callable[[], Awaitable[Any]],
+        merge_key: str | None = None,
+    ) -> tuple[asyncio.Future[None], bool]:
+        """Queue a command.
+
+        Returns:
+            A future resolved when the command (or the command it was merged
+            into) has been sent, and whether the command was merged
+        """
+        if (
+            merge_key is not None
+            and self._queue
+            and self._queue[-1].merge_key == merge_key
+        ):
+            queued = self._queue[-1]
+            queued.command = command
+            _LOGGER.debug(
+                "Merged %s command for thermostat %s", merge_key, self.serial_number
+            )
+            return queued.future, True
+
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        self._queue.append(_QueuedCommand(command, merge_key, future))
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_process(),
+                f"pentairthermalwifi command queue {self.serial_number}",
+            )
+        return future, False
+
+    async def _async_process(self) -> None:
+        """Send the queued commands, keeping at most one request in flight."""
+        try:
+            while self._queue:
+                queued = self._queue.popleft()
+                try:
+                    await queued.command()
+                except asyncio.CancelledError:
+                    queued.future.cancel()
+                    raise
+                except Exception as err:
+                    queued.future.set_exception(err)
+                else:
+                    queued.future.set_result(None)
+        finally:
+            self._task = None
+
+    async def async_cancel(self) -> None:
+        """Cancel the queued commands and the command in flight."""
+        while self._queue:
+            self._queue.popleft().future.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
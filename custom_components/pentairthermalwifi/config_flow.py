@@ -11,7 +11,8 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN
+from .api import async_use_shared_http_client
+from .const import CONF_SESSION_ID, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,18 +38,22 @@ class PentairThermalWiFiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             # Validate credentials by attempting authentication
             try:
-                async with AsyncPentairThermalWifi(
+                client = AsyncPentairThermalWifi(
                     email=user_input[CONF_EMAIL],
                     password=user_input[CONF_PASSWORD],
-                ) as client:
-                    await client.authenticate()
-                    # Use email as unique ID
-                    await self.async_set_unique_id(user_input[CONF_EMAIL])
-                    self._abort_if_unique_id_configured()
-                    return self.async_create_entry(
-                        title=f"Pentair Thermal ({user_input[CONF_EMAIL]})",
-                        data=user_input,
-                    )
+                )
+                # The shared HTTP client is owned by Home Assistant, so there
+                # is nothing to close afterwards
+                async_use_shared_http_client(self.hass, client)
+                auth = await client.authenticate()
+                # Use email as unique ID
+                await self.async_set_unique_id(user_input[CONF_EMAIL])
+                self._abort_if_unique_id_configured()
+                # Keep the session so setup does not have to log in again
+                return self.async_create_entry(
+                    title=f"Pentair Thermal ({user_input[CONF_EMAIL]})",
+                    data={**user_input, CONF_SESSION_ID: auth.session_id},
+                )
             except AuthenticationError:
                 _LOGGER.error("Authentication failed with provided credentials")
                 errors["base"] = "invalid_auth"
@@ -5,6 +5,7 @@ DOMAIN = "pentairthermalwifi"
 # Configuration
 CONF_EMAIL = "email"
 CONF_PASSWORD = "password"
+CONF_SESSION_ID = "session_id"
 
 # Defaults
 DEFAULT_NAME = "Pentair Thermal WiFi"
@@ -14,3 +15,69 @@ PLATFORMS = ["climate", "sensor", "binary_sensor"]
 
 # Coordinator
 COORDINATOR = "coordinator"
+
+# Monitoring supervisor, request scheduler and HTTP client shared by all
+# config entries
+MONITOR = "monitor"
+SCHEDULER = "scheduler"
+HTTP_CLIENT = "http_client"
+
+# Seconds before a request to the cloud times out, as in the library. Fetching
+# a large account can take well over the httpx default of 5 seconds.
+REQUEST_TIMEOUT = 30.0
+
+# Push notifications arriving within this window (seconds) are merged per
+# thermostat and dispatched together, but never delayed beyond the max latency
+DEFAULT_COALESCE_WINDOW = 0.1
+DEFAULT_COALESCE_MAX_LATENCY = 0.5
+
+# Seconds to wait for the push notification confirming a command before
+# falling back to a refresh
+DEFAULT_COMMAND_TIMEOUT = 15.0
+
+# Consecutive refreshes a thermostat must be missing from before its device
+# is removed, so a partial response does not remove a renamed device
+MISSED_REFRESHES_BEFORE_REMOVAL = 2
+
+# Seconds to wait before persisting the thermostat snapshot after a change
+SNAPSHOT_SAVE_DELAY = 30
+
+# Seconds between connection attempts when starting from a snapshot
+CONNECT_RETRY_INTERVAL = 60
+
+# Seconds the cloud may keep a notification long-poll open
+NOTIFICATION_TIMEOUT = 300.0
+
+# Bounds (seconds) of the jittered exponential backoff between long-polls
+# after errors. Once an account used up its restart budget within the
+# window, it is only retried at the maximum delay.
+MONITOR_RETRY_MIN = 1.0
+MONITOR_RETRY_MAX = 300.0
+MONITOR_RESTART_BUDGET = 10
+MONITOR_RESTART_WINDOW = 600.0
+
+# Update modes of the coordinator
+UPDATE_MODE_PUSH = "push"
+UPDATE_MODE_POLL = "poll"
+
+# Polling interval bounds (seconds) while push notifications are unavailable.
+# The interval doubles after every poll that finds no change.
+FALLBACK_POLL_INTERVAL_MIN = 30.0
+FALLBACK_POLL_INTERVAL_MAX = 300.0
+
+# Seconds a notification long-poll may stay open beyond its timeout before
+# the push channel is considered silent
+NOTIFICATION_SILENCE_GRACE = 30.0
+
+# Requests per second, burst size and concurrent requests allowed towards the
+# cloud for all accounts together. Notification long-polls are not limited.
+REQUEST_RATE = 5.0
+REQUEST_BURST = 10
+REQUEST_MAX_CONCURRENT = 4
+
+# Request priorities, lower runs first
+PRIORITY_COMMAND = 0
+PRIORITY_REFRESH = 1
+
+# Thermostats updated at the same time by the set_group service
+SET_GROUP_MAX_CONCURRENT = 5
@@ -1,23 +1,123 @@
 """DataUpdateCoordinator for Pentair Thermal WiFi integration."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from functools import partial
 import logging
+from typing import Any
 
 from pypentairthermalwifi import (
     AsyncPentairThermalWifi,
+    AuthenticationError,
+    Group,
     Notification,
     PentairThermalWifiError,
+    RegulationMode,
+    Thermostat,
+    ThermostatNotFoundError,
     ThermostatsResponse,
+    celsius_to_temp,
 )
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .command_queue import ThermostatCommandQueue
+from .const import (
+    DEFAULT_COALESCE_MAX_LATENCY,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_COMMAND_TIMEOUT,
+    DOMAIN,
+    FALLBACK_POLL_INTERVAL_MAX,
+    FALLBACK_POLL_INTERVAL_MIN,
+    MISSED_REFRESHES_BEFORE_REMOVAL,
+    PRIORITY_COMMAND,
+    PRIORITY_REFRESH,
+    SNAPSHOT_SAVE_DELAY,
+    UPDATE_MODE_POLL,
+    UPDATE_MODE_PUSH,
+)
+from .monitor import MonitorHealth, MonitorSubscription, async_get_monitor
+from .scheduler import async_get_scheduler
+from .single_flight import SingleFlight
+from .store import snapshot_from_dict, snapshot_to_dict
+from .view import ThermostatView
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class CoordinatorStats:
+    """Counters describing the work done by the coordinator and its entities."""
+
+    state_writes: int = 0
+    suppressed_state_writes: int = 0
+    notifications: int = 0
+    coalesced_notifications: int = 0
+    optimistic_updates: int = 0
+    merged_commands: int = 0
+    # Commands not sent because the thermostat was already in the target state
+    skipped_commands: int = 0
+    commands_confirmed: int = 0
+    command_rollbacks: int = 0
+    command_timeouts: int = 0
+    targeted_refreshes: int = 0
+    last_command_latency: float | None = None
+    push_to_poll_transitions: int = 0
+    poll_to_push_transitions: int = 0
+    resyncs: int = 0
+    incremental_refreshes: int = 0
+    # Updates dropped because the cache already held newer data
+    stale_notifications: int = 0
+    stale_refresh_results: int = 0
+    # Refreshes that joined an identical refresh already in flight
+    deduplicated_refreshes: int = 0
+    deduplicated_thermostat_refreshes: int = 0
+    # Thermostats whose listeners were skipped because their content was
+    # unchanged by a refresh
+    unchanged_refreshed_thermostats: int = 0
+    fallback_polls: int = 0
+    # Setup phase -> seconds spent in it
+    setup_phases: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class RefreshChanges:
+    """Thermostats that differ between the cached data and a refresh."""
+
+    changed: set[str] = field(default_factory=set)
+    added: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        """Return True if any thermostat differs."""
+        return bool(self.changed or self.added or self.removed)
+
+
+@dataclass
+class _PendingCommand:
+    """A thermostat command awaiting its push confirmation."""
+
+    changes: dict[str, Any]
+    started: float
+    in_flight: bool = True
+    cancel_timeout: CALLBACK_TYPE | None = None
+
+    def cancel(self) -> None:
+        """Cancel the confirmation timeout."""
+        if self.cancel_timeout:
+            self.cancel_timeout()
+            self.cancel_timeout = None
+
+
 class PentairThermalWiFiCoordinator(DataUpdateCoordinator[ThermostatsResponse]):
     """Class to manage fetching Pentair Thermal WiFi data using push notifications."""
 
@@ -25,53 +125,810 @@ class PentairThermalWiFiCoordinator(DataUpdateCoordinator[ThermostatsResponse]):
         self,
         hass: HomeAssistant,
         client: AsyncPentairThermalWifi,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        coalesce_max_latency: float = DEFAULT_COALESCE_MAX_LATENCY,
+        optimistic: bool = True,
+        command_timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        store: Store[dict[str, Any]] | None = None,
+        poll_interval_min: float = FALLBACK_POLL_INTERVAL_MIN,
+        poll_interval_max: float = FALLBACK_POLL_INTERVAL_MAX,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            # No update_interval - we use push notifications instead of polling
+            # No update_interval - we use push notifications instead of polling,
+            # unless the push channel is unavailable
         )
         self.client = client
-        self._monitoring_started = False
+        self.optimistic = optimistic
+        # True while the data comes from the persisted snapshot
+        self.stale = False
+        self._store = store
+        self._subscription: MonitorSubscription | None = None
+        self.update_mode = UPDATE_MODE_PUSH
+        self._poll_interval_min = poll_interval_min
+        self._poll_interval_max = poll_interval_max
+        self.stats = CoordinatorStats()
+        self._coalesce_window = coalesce_window
+        self._coalesce_max_latency = coalesce_max_latency
+        # Serial number -> latest thermostat received within the coalescing
+        # window, with the version it arrived at
+        self._pending_notifications: dict[str, tuple[Thermostat, int]] = {}
+        self._pending_since: float | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._flush_job = HassJob(
+            self._async_flush_notifications, "flush pentairthermalwifi notifications"
+        )
+        # The cached data is never changed in place: every update publishes a
+        # new snapshot that shares the unchanged groups and thermostats with
+        # the previous one, and increments the generation
+        self.generation = 0
+        # Serial number -> (position of its group, position in group, thermostat)
+        self._index: dict[str, tuple[int, int, Thermostat]] = {}
+        # Serial number -> hash of the content of the cached thermostat
+        self._hashes: dict[str, int] = {}
+        # Serial number -> view of the cached thermostat read by its entities
+        self._views: dict[str, ThermostatView] = {}
+        # Every notification, refresh and command takes the next version when
+        # it arrives or starts. Serial number -> version of the cached
+        # thermostat, so updates observed before it can be dropped.
+        self._version = 0
+        self._versions: dict[str, int] = {}
+        # Serial number -> (last thermostat reported by the cloud, its version),
+        # without the optimistic values of pending commands
+        self._confirmed: dict[str, tuple[Thermostat, int]] = {}
+        # Serial number -> sequence number of its last accepted notification
+        self._sequence_nrs: dict[str, int] = {}
+        # Session the sequence numbers were received in
+        self._sequence_session_id: str | None = None
+        # Requests to the cloud are rate limited for all accounts together
+        self._scheduler = async_get_scheduler(hass)
+        # Fetches of the whole account, keyed by None
+        self._account_fetches: SingleFlight[
+            tuple[int, ThermostatsResponse]
+        ] = SingleFlight(
+            hass, f"{DOMAIN} fetch"
+        )
+        # Single-thermostat refreshes, keyed by serial number
+        self._thermostat_refreshes: SingleFlight[None] = SingleFlight(
+            hass, f"{DOMAIN} refresh"
+        )
+        # Thermostats changed by the refresh whose listeners are updated next
+        self._refresh_changes: RefreshChanges | None = None
+        self.last_refresh_changes: RefreshChanges | None = None
+        # Serial number -> listeners of the entities belonging to that thermostat
+        self._device_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        # Platform callbacks creating the entities of added thermostats
+        self._added_listeners: list[Callable[[list[Thermostat]], None]] = []
+        # Serial number -> consecutive refreshes a thermostat whose device is
+        # kept has been missing from
+        self._missing_thermostats: dict[str, int] = {}
+        self._command_timeout = command_timeout
+        # Serial number -> command awaiting its push confirmation
+        self._pending_commands: dict[str, _PendingCommand] = {}
+        self._command_queues: dict[str, ThermostatCommandQueue] = {}
+        # Queued command -> cached thermostat from before it was queued
+        self._rollback_thermostats: dict[asyncio.Future[None], Thermostat | None] = {}
 
     async def _async_update_data(self) -> ThermostatsResponse:
         """Fetch data from API."""
+        if self._account_fetches.in_flight(None):
+            self.stats.deduplicated_refreshes += 1
         try:
-            return await self.client.get_thermostats()
+            version, data = await self._async_fetch_account()
+        except AuthenticationError as err:
+            # The stored session was rejected and logging in again failed
+            raise ConfigEntryAuthFailed(f"Authentication failed: {err}") from err
         except PentairThermalWifiError as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+        data = self._reuse_cached_thermostats(data, version)
+        previous_hashes = self._hashes
+        incremental = self.data is not None and self.last_update_success
+        self._rebuild_index(data, version)
+        changes = _diff_hashes(previous_hashes, self._hashes)
+        self.last_refresh_changes = changes
+        if changes.added or changes.removed:
+            _LOGGER.info(
+                "Thermostats added: %s, removed: %s",
+                sorted(changes.added),
+                sorted(changes.removed),
+            )
+            self._async_thermostats_added(changes.added)
+        self._async_remove_missing_devices(changes.removed)
+        if incremental and not self.stale:
+            # Only the entities of the changed thermostats need to update
+            self._refresh_changes = changes
+        if self.update_mode == UPDATE_MODE_POLL:
+            self.stats.fallback_polls += 1
+            self._async_adapt_poll_interval(changed=bool(changes))
+        self.stale = False
+        self._async_save_snapshot()
+        return data
+
+    async def _async_fetch_account(self) -> tuple[int, ThermostatsResponse]:
+        """Fetch all thermostats, sharing a fetch that is already in flight.
+
+        Returns:
+            The version taken when the request was sent, shared by every
+            caller of the fetch, and the thermostats
+        """
+        return await self._account_fetches.async_call(
+            None,
+            partial(
+                self._scheduler.async_run,
+                PRIORITY_REFRESH,
+                self._async_get_thermostats,
+            ),
+        )
+
+    async def _async_get_thermostats(self) -> tuple[int, ThermostatsResponse]:
+        """Fetch all thermostats with the version of the request."""
+        version = self._next_version()
+        return version, await self.client.get_thermostats()
+
+    async def async_load_snapshot(self) -> bool:
+        """Seed the cached data from the persisted snapshot.
+
+        The data is marked stale until the first successful refresh.
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        if self._store is None or (stored := await self._store.async_load()) is None:
+            return False
+        if (data := snapshot_from_dict(stored["snapshot"])) is None:
+            return False
+
+        _LOGGER.debug("Loaded thermostat snapshot")
+        self._rebuild_index(data)
+        for _, _, thermostat in self._index.values():
+            self._confirm(thermostat, 0)
+        self.data = data
+        self.stale = True
+        return True
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Persist the cached data after a short delay."""
+        if self._store is not None:
+            self._store.async_delay_save(
+                lambda: {"snapshot": snapshot_to_dict(self.data)},
+                SNAPSHOT_SAVE_DELAY,
+            )
+
+    def _next_version(self) -> int:
+        """Return the version of an update that arrives or starts now."""
+        self._version += 1
+        return self._version
+
+    def _is_stale(self, serial_number: str, version: int) -> bool:
+        """Return True if the cached thermostat is newer than the version."""
+        return self._versions.get(serial_number, 0) > version
+
+    def _confirm(self, thermostat: Thermostat, version: int) -> None:
+        """Remember a thermostat reported by the cloud, unless a newer one is known."""
+        serial_number = thermostat.serial_number
+        if (confirmed := self._confirmed.get(serial_number)) is None or (
+            confirmed[1] <= version
+        ):
+            self._confirmed[serial_number] = (thermostat, version)
+
+    def _reuse_cached_thermostats(
+        self, data: ThermostatsResponse, version: int
+    ) -> ThermostatsResponse:
+        """Put cached thermostats into a fetched response before it is published.
+
+        Cached thermostats that were updated after the fetch started are kept,
+        and those with unchanged content are shared with the new snapshot. The
+        fetched response is left untouched, since a refresh that joined the
+        fetch gets the response another refresh has already published.
+        """
+        groups: list[Group] = []
+        for group in data.groups:
+            thermostats: list[Thermostat] = []
+            for thermostat in group.thermostats:
+                serial_number = thermostat.serial_number
+                self._confirm(thermostat, version)
+                if (cached := self.get_thermostat(serial_number)) is not None:
+                    if self._is_stale(serial_number, version):
+                        self.stats.stale_refresh_results += 1
+                        thermostat = cached
+                    elif _content_hash(thermostat) == self._hashes[serial_number]:
+                        thermostat = cached
+                thermostats.append(thermostat)
+            groups.append(replace(group, thermostats=thermostats))
+        return replace(data, groups=groups)
+
+    def _rebuild_index(self, data: ThermostatsResponse, version: int = 0) -> None:
+        """Rebuild the serial number index from a full thermostats response."""
+        index = {
+            thermostat.serial_number: (group_position, position, thermostat)
+            for group_position, group in enumerate(data.groups)
+            for position, thermostat in enumerate(group.thermostats)
+        }
+        self._versions = {
+            serial_number: max(version, self._versions.get(serial_number, 0))
+            for serial_number in index
+        }
+        reused = {
+            serial_number
+            for serial_number, (_, _, thermostat) in index.items()
+            if self.get_thermostat(serial_number) is thermostat
+        }
+        self._hashes = {
+            serial_number: self._hashes[serial_number]
+            if serial_number in reused
+            else _content_hash(thermostat)
+            for serial_number, (_, _, thermostat) in index.items()
+        }
+        self._views = {
+            serial_number: self._views[serial_number]
+            if serial_number in reused
+            else ThermostatView.from_thermostat(thermostat)
+            for serial_number, (_, _, thermostat) in index.items()
+        }
+        self._confirmed = {
+            serial_number: confirmed
+            for serial_number, confirmed in self._confirmed.items()
+            if serial_number in index
+        }
+        self._index = index
+        self.generation += 1
+
+    def get_thermostat(self, serial_number: str) -> Thermostat | None:
+        """Return the cached thermostat with the given serial number."""
+        if (entry := self._index.get(serial_number)) is None:
+            return None
+        return entry[2]
+
+    def get_view(self, serial_number: str) -> ThermostatView | None:
+        """Return the view of the cached thermostat with the given serial number."""
+        return self._views.get(serial_number)
+
+    def _replace_thermostat(
+        self, thermostat: Thermostat, version: int | None = None
+    ) -> bool:
+        """Replace a thermostat in the cached data, return False if it is unknown."""
+        if (entry := self._index.get(thermostat.serial_number)) is None:
+            return False
+        group_position, position, _ = entry
+        self._versions[thermostat.serial_number] = (
+            self._next_version() if version is None else version
+        )
+        group = self.data.groups[group_position]
+        thermostats = list(group.thermostats)
+        thermostats[position] = thermostat
+        self._publish_group(group_position, replace(group, thermostats=thermostats))
+        self._index[thermostat.serial_number] = (group_position, position, thermostat)
+        self._hashes[thermostat.serial_number] = _content_hash(thermostat)
+        self._views[thermostat.serial_number] = ThermostatView.from_thermostat(
+            thermostat
+        )
+        return True
+
+    def _insert_thermostat(
+        self, thermostat: Thermostat, version: int | None = None
+    ) -> None:
+        """Add a thermostat that is not in the cached data yet to its group."""
+        self._versions[thermostat.serial_number] = (
+            self._next_version() if version is None else version
+        )
+        for group_position, group in enumerate(self.data.groups):
+            if group.group_id == thermostat.group_id:
+                break
+        else:
+            group_position = len(self.data.groups)
+            group = Group(
+                group_name=thermostat.group_name,
+                group_id=thermostat.group_id,
+                group_color="",
+                thermostats=[],
+            )
+        self._publish_group(
+            group_position,
+            replace(group, thermostats=[*group.thermostats, thermostat]),
+        )
+        self._index[thermostat.serial_number] = (
+            group_position,
+            len(group.thermostats),
+            thermostat,
+        )
+        self._hashes[thermostat.serial_number] = _content_hash(thermostat)
+        self._views[thermostat.serial_number] = ThermostatView.from_thermostat(
+            thermostat
+        )
+
+    def _publish_group(self, group_position: int, group: Group) -> None:
+        """Publish a snapshot of the cached data with one group replaced."""
+        groups = list(self.data.groups)
+        if group_position == len(groups):
+            groups.append(group)
+        else:
+            groups[group_position] = group
+        self.data = replace(self.data, groups=groups)
+        self.generation += 1
+
+    async def async_refresh_thermostat(self, serial_number: str) -> None:
+        """Refresh a single thermostat and update only its entities.
+
+        Concurrent refreshes of the same thermostat share one request, and
+        none is sent while the whole account is being fetched, since that
+        fetch returns the thermostat as well.
+        """
+        if self._account_fetches.in_flight(None):
+            self.stats.deduplicated_thermostat_refreshes += 1
+            with suppress(PentairThermalWifiError):
+                # The refresh that started the fetch reports its errors
+                await self._async_fetch_account()
+            return
+        if self._thermostat_refreshes.in_flight(serial_number):
+            self.stats.deduplicated_thermostat_refreshes += 1
+        await self._thermostat_refreshes.async_call(
+            serial_number, partial(self._async_refresh_thermostat, serial_number)
+        )
+
+    async def _async_refresh_thermostat(self, serial_number: str) -> None:
+        """Fetch a single thermostat and update only its entities."""
+        if not self.data:
+            await self.async_refresh()
+            return
+
+        version = self._next_version()
+        try:
+            thermostat = await self._scheduler.async_run(
+                PRIORITY_REFRESH,
+                partial(self.client.get_thermostat, serial_number),
+            )
+        except ThermostatNotFoundError:
+            _LOGGER.warning("Thermostat %s not found in account", serial_number)
+            return
+        except PentairThermalWifiError as err:
+            _LOGGER.warning("Error refreshing thermostat %s: %s", serial_number, err)
+            return
+
+        self.stats.targeted_refreshes += 1
+        self._confirm(thermostat, version)
+        if self._is_stale(serial_number, version):
+            # A notification or command updated it while the request ran
+            self.stats.stale_refresh_results += 1
+            return
+        if not self._replace_thermostat(thermostat, version):
+            _LOGGER.info("Adding thermostat %s (%s)", serial_number, thermostat.room)
+            self._insert_thermostat(thermostat, version)
+            self._async_thermostats_added({serial_number})
+        self._async_save_snapshot()
+        self.async_update_device_listeners(serial_number)
+
+    @callback
+    def async_set_thermostat(self, thermostat: Thermostat) -> None:
+        """Replace a cached thermostat and update that thermostat's entities."""
+        if self._replace_thermostat(thermostat):
+            self.async_update_device_listeners(thermostat.serial_number)
+
+    async def async_send_command(
+        self,
+        serial_number: str,
+        changes: dict[str, Any],
+        command: Callable[[], Awaitable[Any]],
+        merge_key: str | None = None,
+        await_confirmation: bool = True,
+    ) -> None:
+        """Send a thermostat command and wait for its push confirmation.
+
+        In optimistic mode the expected field values are patched into the cached
+        thermostat before the command is sent, and rolled back if it fails.
+        The command completes when a push notification reports the expected
+        values; if none arrives within the command timeout, only that
+        thermostat is refreshed. Callers that reconcile the state themselves
+        pass await_confirmation=False to skip the confirmation.
+
+        Commands for a thermostat are sent one at a time through its command
+        queue, where a queued command is replaced by a newer one with the same
+        merge key.
+        """
+        if (pending := self._pending_commands.pop(serial_number, None)) is not None:
+            pending.cancel()
+
+        pending = _PendingCommand(changes, self.hass.loop.time())
+        self._pending_commands[serial_number] = pending
+
+        previous = self.get_thermostat(serial_number)
+        expected: Thermostat | None = None
+        if self.optimistic and previous is not None:
+            expected = replace(previous, **changes)
+            self.stats.optimistic_updates += 1
+            self.async_set_thermostat(expected)
+
+        if (queue := self._command_queues.get(serial_number)) is None:
+            queue = ThermostatCommandQueue(self.hass, serial_number)
+            self._command_queues[serial_number] = queue
+        future, merged = queue.async_enqueue(
+            partial(self._scheduler.async_run, PRIORITY_COMMAND, command), merge_key
+        )
+        if merged:
+            self.stats.merged_commands += 1
+            # The optimistic state of the command merged into was never sent,
+            # a failure rolls back to the state from before that command
+            previous = self._rollback_thermostats.get(future, previous)
+        else:
+            self._rollback_thermostats[future] = previous
+            future.add_done_callback(self._rollback_thermostats.pop)
+
+        try:
+            await future
+        except Exception:
+            if self._pending_commands.get(serial_number) is pending:
+                del self._pending_commands[serial_number]
+            # Only roll back if nothing newer replaced the optimistic state
+            if expected is not None and self.get_thermostat(serial_number) is expected:
+                self.stats.command_rollbacks += 1
+                self.async_set_thermostat(previous)
+            raise
+        finally:
+            pending.in_flight = False
+
+        if self._pending_commands.get(serial_number) is not pending:
+            # Already confirmed by a push that arrived while the command ran
+            return
+        if not await_confirmation:
+            del self._pending_commands[serial_number]
+            return
+
+        pending.cancel_timeout = async_call_later(
+            self.hass,
+            self._command_timeout,
+            partial(self._async_command_timed_out, serial_number, pending),
+        )
+
+    async def async_set_temperature(
+        self,
+        serial_number: str,
+        temperature: float,
+        await_confirmation: bool = True,
+    ) -> None:
+        """Set the manual temperature of a thermostat in Celsius."""
+        await self.async_send_command(
+            serial_number,
+            {
+                "manual_temperature": celsius_to_temp(temperature),
+                "regulation_mode": RegulationMode.MANUAL,
+            },
+            lambda: self.client.set_manual_temperature(serial_number, temperature),
+            merge_key="temperature",
+            await_confirmation=await_confirmation,
+        )
+
+    async def async_set_regulation_mode(
+        self,
+        serial_number: str,
+        regulation_mode: RegulationMode,
+        await_confirmation: bool = True,
+    ) -> None:
+        """Set the regulation mode of a thermostat.
+
+        Nothing is sent if the thermostat is already in the mode and no other
+        command is pending, except for boost, which restarts the boost period.
+        """
+        if (thermostat := self.get_thermostat(serial_number)) is None:
+            return
+        if (
+            regulation_mode != RegulationMode.BOOST
+            and thermostat.regulation_mode == regulation_mode
+            and serial_number not in self._pending_commands
+        ):
+            self.stats.skipped_commands += 1
+            return
+
+        command: Callable[[], Awaitable[Any]]
+        if regulation_mode == RegulationMode.OFF:
+            command = partial(self.client.turn_off, serial_number)
+        elif regulation_mode == RegulationMode.BOOST:
+            command = partial(self.client.start_boost, serial_number)
+        else:
+            command = partial(
+                self._async_update_fields,
+                serial_number,
+                {"regulation_mode": regulation_mode},
+            )
+        await self.async_send_command(
+            serial_number,
+            {"regulation_mode": regulation_mode},
+            command,
+            await_confirmation=await_confirmation,
+        )
+
+    async def _async_update_fields(
+        self, serial_number: str, changes: dict[str, Any]
+    ) -> None:
+        """Write changed fields of a thermostat.
+
+        The cloud only accepts complete thermostats, so the changes are applied
+        to a copy of the last thermostat reported by the cloud when the command
+        is sent rather than when it is queued. Fields updated by notifications
+        received meanwhile are sent as pushed, and the optimistic values of
+        other queued commands are not sent before those commands.
+        """
+        if (confirmed := self._confirmed.get(serial_number)) is None:
+            raise ThermostatNotFoundError(f"Thermostat {serial_number} not found")
+        thermostat, _ = confirmed
+        await self.client.update_thermostat(
+            serial_number, replace(thermostat, **changes)
+        )
+
+    @callback
+    def _async_command_timed_out(
+        self, serial_number: str, pending: _PendingCommand, _now: datetime
+    ) -> None:
+        """Fall back to a refresh when a command was not confirmed by a push."""
+        if self._pending_commands.get(serial_number) is not pending:
+            return
+
+        del self._pending_commands[serial_number]
+        self.stats.command_timeouts += 1
+        _LOGGER.debug(
+            "No push confirmation for thermostat %s, refreshing", serial_number
+        )
+        self.hass.async_create_task(self.async_refresh_thermostat(serial_number))
+
+    def _reconcile_pending_command(self, thermostat: Thermostat) -> Thermostat:
+        """Reconcile a pushed thermostat with a pending command."""
+        serial_number = thermostat.serial_number
+        if (pending := self._pending_commands.get(serial_number)) is None:
+            return thermostat
+
+        applied = all(
+            getattr(thermostat, field) == value
+            for field, value in pending.changes.items()
+        )
+        if not applied and pending.in_flight:
+            # The cloud has not processed the command yet
+            if self.optimistic:
+                return replace(thermostat, **pending.changes)
+            return thermostat
+
+        del self._pending_commands[serial_number]
+        pending.cancel()
+        if applied:
+            self.stats.commands_confirmed += 1
+            self.stats.last_command_latency = round(
+                self.hass.loop.time() - pending.started, 3
+            )
+        else:
+            _LOGGER.debug(
+                "Thermostat %s did not apply %s, rolling back",
+                serial_number,
+                pending.changes,
+            )
+            self.stats.command_rollbacks += 1
+        return thermostat
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates.
+
+        Entities pass their thermostat serial number as context so push
+        notifications can be dispatched to that device's entities only.
+        """
+        remove_listener = super().async_add_listener(update_callback, context)
+        if context is None:
+            return remove_listener
+
+        self._device_listeners.setdefault(context, []).append(update_callback)
+
+        @callback
+        def remove_device_listener() -> None:
+            """Remove update listener."""
+            remove_listener()
+            listeners = self._device_listeners[context]
+            listeners.remove(update_callback)
+            if not listeners:
+                del self._device_listeners[context]
+
+        return remove_device_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners, after a refresh only those of changed thermostats."""
+        changes, self._refresh_changes = self._refresh_changes, None
+        if changes is None or not self.last_update_success:
+            super().async_update_listeners()
+            return
+
+        self.stats.incremental_refreshes += 1
+        self.stats.unchanged_refreshed_thermostats += len(self._index) - len(
+            changes.changed | changes.added
+        )
+        # Removed thermostats update so their entities become unavailable, and
+        # added ones that still have entities from before they went missing
+        for serial_number in changes.changed | changes.added | changes.removed:
+            self.async_update_device_listeners(serial_number)
+        if changes:
+            for update_callback, context in list(self._listeners.values()):
+                if context is None:
+                    update_callback()
+
+    @callback
+    def async_add_thermostats_listener(
+        self, listener: Callable[[list[Thermostat]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for thermostats added to the account after the first refresh.
+
+        Platforms use this to create the entities of new thermostats without
+        reloading the config entry.
+        """
+        self._added_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove added thermostats listener."""
+            self._added_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def _async_thermostats_added(self, serial_numbers: set[str]) -> None:
+        """Tell the platforms about thermostats added to the cached data."""
+        # A thermostat back after missing from a refresh still has its entities
+        thermostats = [
+            thermostat
+            for serial_number in sorted(serial_numbers)
+            if self._missing_thermostats.pop(serial_number, None) is None
+            and (thermostat := self.get_thermostat(serial_number)) is not None
+        ]
+        if not thermostats:
+            return
+        for listener in list(self._added_listeners):
+            listener(thermostats)
+
+    @callback
+    def _async_remove_missing_devices(self, serial_numbers: set[str]) -> None:
+        """Remove the devices of thermostats missing from consecutive refreshes.
+
+        Args:
+            serial_numbers: Thermostats removed from the cached data by the refresh
+        """
+        for serial_number in serial_numbers:
+            self._missing_thermostats.setdefault(serial_number, 0)
+        if not self._index:
+            # A response without any thermostat is more likely a glitch of
+            # the cloud than an empty account
+            return
+
+        missing = {
+            serial_number: missed + 1
+            for serial_number, missed in self._missing_thermostats.items()
+        }
+        self._missing_thermostats = {
+            serial_number: missed
+            for serial_number, missed in missing.items()
+            if missed < MISSED_REFRESHES_BEFORE_REMOVAL
+        }
+        self._async_remove_devices(missing.keys() - self._missing_thermostats.keys())
+
+    @callback
+    def _async_remove_devices(self, serial_numbers: set[str]) -> None:
+        """Remove the devices of thermostats that left the account.
+
+        Removing a device removes its entities as well.
+        """
+        if self.config_entry is None:
+            return
+        device_registry = dr.async_get(self.hass)
+        for serial_number in serial_numbers:
+            if (pending := self._pending_commands.pop(serial_number, None)) is not None:
+                pending.cancel()
+            if device := device_registry.async_get_device(
+                identifiers={(DOMAIN, serial_number)}
+            ):
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.config_entry.entry_id
+                )
+
+    @callback
+    def async_update_device_listeners(self, serial_number: str) -> None:
+        """Update the listeners registered for a single thermostat."""
+        for update_callback in list(self._device_listeners.get(serial_number, ())):
+            update_callback()
+
+    @property
+    def monitor_health(self) -> MonitorHealth | None:
+        """Return the health of the push notification channel."""
+        if self._subscription is None:
+            return None
+        return self._subscription.health
+
+    @callback
+    def _async_switch_to_polling(self) -> None:
+        """Poll the thermostats while push notifications are unavailable."""
+        if self.update_mode == UPDATE_MODE_POLL:
+            return
+
+        _LOGGER.warning(
+            "Push notifications unavailable, polling every %s seconds",
+            self._poll_interval_min,
+        )
+        self.update_mode = UPDATE_MODE_POLL
+        self.stats.push_to_poll_transitions += 1
+        self.update_interval = timedelta(seconds=self._poll_interval_min)
+        # Catch up on the changes that may have been missed right away
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_switch_to_push(self) -> None:
+        """Stop polling once push notifications work again."""
+        if self.update_mode == UPDATE_MODE_PUSH:
+            return
+
+        _LOGGER.info("Push notifications available again, stopped polling")
+        self.update_mode = UPDATE_MODE_PUSH
+        self.stats.poll_to_push_transitions += 1
+        self.update_interval = None
+        self._async_unsub_refresh()
+
+    @callback
+    def _async_handle_reconnect(self) -> None:
+        """Resync once after the push channel has reconnected."""
+        self._async_switch_to_push()
+        # Changes made while disconnected were never pushed, and a new
+        # session may number its notifications from the start again
+        self._sequence_nrs.clear()
+        self.stats.resyncs += 1
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_adapt_poll_interval(self, changed: bool) -> None:
+        """Poll quickly while things change and back off while they do not."""
+        if changed or self.update_interval is None:
+            seconds = self._poll_interval_min
+        else:
+            seconds = min(
+                self.update_interval.total_seconds() * 2, self._poll_interval_max
+            )
+        self.update_interval = timedelta(seconds=seconds)
+
     async def async_start_monitoring(self) -> None:
         """Start monitoring for thermostat changes via push notifications."""
-        if self._monitoring_started:
+        if self._subscription is not None:
             _LOGGER.debug("Monitoring already started")
             return
 
         _LOGGER.info("Starting push notification monitoring")
-        try:
-            await self.client.start_monitoring(
-                callback=self._handle_notification,
-                error_callback=self._handle_error,
-            )
-            self._monitoring_started = True
-        except Exception as err:
-            _LOGGER.error("Failed to start monitoring: %s", err)
-            raise
+        # The supervisor shared by all accounts runs the long-polls
+        self._subscription = async_get_monitor(self.hass).async_subscribe(
+            self.client,
+            callback=self._handle_notification,
+            error_callback=self._handle_error,
+            recovery_callback=self._async_handle_reconnect,
+        )
 
     async def async_stop_monitoring(self) -> None:
         """Stop monitoring for thermostat changes."""
-        if not self._monitoring_started:
+        if self._subscription is None:
             return
 
         _LOGGER.info("Stopping push notification monitoring")
-        try:
-            await self.client.stop_monitoring()
-        except Exception as err:
-            _LOGGER.error("Error stopping monitoring: %s", err)
-        finally:
-            self._monitoring_started = False
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._pending_notifications.clear()
+        self._pending_since = None
+        for pending in self._pending_commands.values():
+            pending.cancel()
+        self._pending_commands.clear()
+        subscription, self._subscription = self._subscription, None
+        await async_get_monitor(self.hass).async_unsubscribe(subscription)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and queued commands, and ignore new runs."""
+        await super().async_shutdown()
+        for queue in self._command_queues.values():
+            await queue.async_cancel()
+        self._command_queues.clear()
 
     async def _handle_notification(self, notification: Notification) -> None:
         """Handle a notification from the API about a thermostat change.
@@ -84,30 +941,94 @@ class PentairThermalWiFiCoordinator(DataUpdateCoordinator[ThermostatsResponse]):
             notification.thermostat.serial_number,
             notification.thermostat.room,
         )
+        self._async_switch_to_push()
 
-        # Update the specific thermostat in our cached data
-        if self.data:
-            updated = False
-            for group in self.data.groups:
-                for i, thermostat in enumerate(group.thermostats):
-                    if thermostat.serial_number == notification.thermostat.serial_number:
-                        group.thermostats[i] = notification.thermostat
-                        updated = True
-                        break
-                if updated:
-                    break
-
-            if updated:
-                # Trigger coordinator update to notify all entities
-                self.async_set_updated_data(self.data)
-            else:
-                _LOGGER.warning(
-                    "Received notification for unknown thermostat: %s",
-                    notification.thermostat.serial_number,
-                )
-        else:
+        if not self.data:
             # No cached data yet, fetch all thermostats
             await self.async_refresh()
+            return
+
+        self.stats.notifications += 1
+        serial_number = notification.thermostat.serial_number
+        # The client logs in again by itself when its session expires, and the
+        # new session may number its notifications from the start again
+        if (session_id := self.client._session_id) != self._sequence_session_id:
+            self._sequence_nrs.clear()
+            self._sequence_session_id = session_id
+        last_sequence_nr = self._sequence_nrs.get(serial_number)
+        # Equal numbers are not dropped, the cloud may not number every change
+        if last_sequence_nr is not None and notification.sequence_nr < last_sequence_nr:
+            _LOGGER.debug(
+                "Dropping out of order notification %s for thermostat %s",
+                notification.sequence_nr,
+                serial_number,
+            )
+            self.stats.stale_notifications += 1
+            return
+        self._sequence_nrs[serial_number] = notification.sequence_nr
+
+        # Merge with pending notifications for the same thermostat, last one wins
+        if serial_number in self._pending_notifications:
+            self.stats.coalesced_notifications += 1
+        self._pending_notifications[serial_number] = (
+            notification.thermostat,
+            self._next_version(),
+        )
+
+        if self._coalesce_window <= 0:
+            self._async_flush_notifications()
+            return
+
+        now = self.hass.loop.time()
+        if self._pending_since is None:
+            self._pending_since = now
+        if self._unsub_flush:
+            self._unsub_flush()
+        # Extend the window on every notification, bounded by the max latency
+        deadline = self._pending_since + self._coalesce_max_latency
+        delay = max(0.0, min(self._coalesce_window, deadline - now))
+        self._unsub_flush = async_call_later(self.hass, delay, self._flush_job)
+
+    @callback
+    def _async_flush_notifications(self, _now: datetime | None = None) -> None:
+        """Apply the coalesced notifications and update the affected entities."""
+        self._unsub_flush = None
+        self._pending_since = None
+        pending, self._pending_notifications = self._pending_notifications, {}
+
+        # Update the specific thermostats in our cached data
+        updated: list[str] = []
+        for serial_number, (thermostat, version) in pending.items():
+            if serial_number in self._index:
+                self._confirm(thermostat, version)
+            if self._is_stale(serial_number, version):
+                # A refresh or command started after this notification arrived
+                self.stats.stale_notifications += 1
+                continue
+            if not self._replace_thermostat(
+                self._reconcile_pending_command(thermostat), version
+            ):
+                _LOGGER.info(
+                    "Received notification for unknown thermostat %s, refreshing it",
+                    serial_number,
+                )
+                self.hass.async_create_task(
+                    self.async_refresh_thermostat(serial_number)
+                )
+                continue
+            updated.append(serial_number)
+
+        if not updated:
+            return
+
+        self._async_save_snapshot()
+        if self.last_update_success:
+            # Only the entities of these thermostats need to update
+            for serial_number in updated:
+                self.async_update_device_listeners(serial_number)
+        else:
+            # Recovering from an error, all entities become available again
+            self.async_set_updated_data(self.data)
 
     async def _handle_error(self, error: Exception) -> None:
         """Handle an error from the monitoring loop.
@@ -116,5 +1037,24 @@ class PentairThermalWiFiCoordinator(DataUpdateCoordinator[ThermostatsResponse]):
             error: The exception that occurred
         """
         _LOGGER.error("Error in monitoring loop: %s", error)
-        self.last_update_success = False
-        self.async_update_listeners()
+        # A successful poll keeps the entities available until the cloud
+        # itself cannot be reached
+        self._async_switch_to_polling()
+
+
+def _content_hash(thermostat: Thermostat) -> int:
+    """Return a hash of all the fields of a thermostat, including its schedules."""
+    return hash(repr(thermostat))
+
+
+def _diff_hashes(previous: dict[str, int], current: dict[str, int]) -> RefreshChanges:
+    """Return the thermostats whose content hash differs between two refreshes."""
+    return RefreshChanges(
+        changed={
+            serial_number
+            for serial_number, content_hash in current.items()
+            if serial_number in previous and previous[serial_number] != content_hash
+        },
+        added=current.keys() - previous.keys(),
+        removed=previous.keys() - current.keys(),
+    )
@@ -0,0 +1,40 @@
+"""Diagnostics support for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import COORDINATOR, DOMAIN
+from .coordinator import PentairThermalWiFiCoordinator
+from .scheduler import async_get_scheduler
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: PentairThermalWiFiCoordinator = hass.data[DOMAIN][entry.entry_id][
+        COORDINATOR
+    ]
+
+    data = coordinator.data
+    changes = coordinator.last_refresh_changes
+    health = coordinator.monitor_health
+    return {
+        "thermostat_count": len(data.get_all_thermostats()) if data else 0,
+        "last_update_success": coordinator.last_update_success,
+        "update_mode": coordinator.update_mode,
+        "generation": coordinator.generation,
+        "stats": asdict(coordinator.stats),
+        "last_refresh_changes": {
+            kind: sorted(serial_numbers)
+            for kind, serial_numbers in asdict(changes).items()
+        }
+        if changes is not None
+        else None,
+        "monitor": asdict(health) if health is not None else None,
+        "scheduler": asdict(async_get_scheduler(hass).stats),
+    }
@@ -0,0 +1,119 @@
+"""Base entity for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from pypentairthermalwifi import Thermostat
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import PentairThermalWiFiCoordinator
+from .view import ThermostatView
+
+
+@callback
+def async_setup_thermostat_entities(
+    coordinator: PentairThermalWiFiCoordinator,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    entity_factory: Callable[[Thermostat], Iterable[Entity]],
+) -> None:
+    """Add the entities of every thermostat, including thermostats added later."""
+
+    @callback
+    def async_add_thermostats(thermostats: list[Thermostat]) -> None:
+        """Add the entities of the thermostats."""
+        async_add_entities(
+            entity for thermostat in thermostats for entity in entity_factory(thermostat)
+        )
+
+    async_add_thermostats(coordinator.data.get_all_thermostats())
+    entry.async_on_unload(
+        coordinator.async_add_thermostats_listener(async_add_thermostats)
+    )
+
+
+class PentairThermalWiFiEntity(CoordinatorEntity[PentairThermalWiFiCoordinator]):
+    """Base class for entities belonging to a Pentair Thermal WiFi thermostat."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: PentairThermalWiFiCoordinator,
+        thermostat: Thermostat,
+        entity_key: str,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator, context=thermostat.serial_number)
+        self._serial_number = thermostat.serial_number
+        self._last_fingerprint: tuple[Any, ...] | None = None
+        self._attr_unique_id = f"{thermostat.serial_number}_{entity_key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, thermostat.serial_number)},
+            "name": thermostat.room,
+            "manufacturer": "Pentair Thermal",
+            "model": "Senz WiFi",
+            "sw_version": thermostat.sw_version,
+        }
+
+    @property
+    def _view(self) -> ThermostatView | None:
+        """Get the current view of the thermostat from the coordinator."""
+        return self.coordinator.get_view(self._serial_number)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        if not super().available:
+            return False
+        view = self._view
+        return view is not None and self._view_available(view)
+
+    def _view_available(self, view: ThermostatView) -> bool:
+        """Return if the thermostat state makes this entity available."""
+        return view.online
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state comes from the persisted snapshot."""
+        return self.coordinator.stale
+
+    def _view_fingerprint(self, view: ThermostatView) -> Any:
+        """Return the view fields that determine this entity's state."""
+        raise NotImplementedError
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return a compact fingerprint of the state this entity exposes."""
+        view = self._view
+        if view is None:
+            return (self.available, self.assumed_state, None)
+        return (self.available, self.assumed_state, self._view_fingerprint(view))
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        # The platform writes the initial state right after this
+        self._last_fingerprint = self._state_fingerprint()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator.
+
+        The state is only written when the fingerprint differs from the one
+        written last, so updates that do not touch this entity are skipped.
+        """
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._last_fingerprint:
+            self.coordinator.stats.suppressed_state_writes += 1
+            return
+
+        self._last_fingerprint = fingerprint
+        self.coordinator.stats.state_writes += 1
+        self.async_write_ha_state()
@@ -0,0 +1,303 @@
+"""Push notification monitoring for all Pentair Thermal WiFi accounts."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import logging
+import random
+from typing import TypeVar
+
+from pypentairthermalwifi import (
+    AsyncPentairThermalWifi,
+    AuthenticationError,
+    Notification,
+    SessionExpiredError,
+)
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    MONITOR,
+    MONITOR_RESTART_BUDGET,
+    MONITOR_RESTART_WINDOW,
+    MONITOR_RETRY_MAX,
+    MONITOR_RETRY_MIN,
+    NOTIFICATION_SILENCE_GRACE,
+    NOTIFICATION_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class MonitorHealth:
+    """Health of the push notification channel of one account."""
+
+    notifications: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    last_error: str | None = None
+    # Event loop time of the last successful long-poll
+    last_success: float | None = None
+    restarts: int = 0
+    reconnects: int = 0
+    # Restarts delayed to the maximum because the restart budget was used up
+    budget_exhausted: int = 0
+    last_retry_delay: float | None = None
+
+
+@dataclass
+class MonitorSubscription:
+    """The push notification subscription of one account."""
+
+    client: AsyncPentairThermalWifi
+    callback: Callable[[Notification], Awaitable[None]]
+    error_callback: Callable[[Exception], Awaitable[None]]
+    # Called when a long-poll succeeds again after errors
+    recovery_callback: CALLBACK_TYPE | None = None
+    health: MonitorHealth = field(default_factory=MonitorHealth)
+    # Event loop time before which no new long-poll is started
+    retry_at: float = 0.0
+    poll: asyncio.Task[Notification | None] | None = None
+    # Event loop time after which the open long-poll is considered silent
+    silent_at: float = 0.0
+    # Event loop times of the restarts within the restart window
+    restart_times: deque[float] = field(default_factory=deque)
+    # Set when the long-poll logged in again after its session expired
+    session_renewed: bool = False
+
+
+@callback
+def async_get_monitor(hass: HomeAssistant) -> MonitoringSupervisor:
+    """Return the monitoring supervisor shared by all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if MONITOR not in domain_data:
+        domain_data[MONITOR] = MonitoringSupervisor(hass)
+    return domain_data[MONITOR]
+
+
+class MonitoringSupervisor:
+    """Run the push notification long-polls of all accounts from one task.
+
+    Every account keeps a single long-poll request open. The supervisor waits
+    on all of them at once, routes each notification to the callback of its
+    account and schedules the retries after errors, so the number of
+    background tasks and timers does not grow with separate loops per account.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        notification_timeout: float = NOTIFICATION_TIMEOUT,
+        retry_min: float = MONITOR_RETRY_MIN,
+        retry_max: float = MONITOR_RETRY_MAX,
+        restart_budget: int = MONITOR_RESTART_BUDGET,
+        restart_window: float = MONITOR_RESTART_WINDOW,
+    ) -> None:
+        """Initialize the supervisor."""
+        self.hass = hass
+        self._notification_timeout = notification_timeout
+        self._retry_min = retry_min
+        self._retry_max = retry_max
+        self._restart_budget = restart_budget
+        self._restart_window = restart_window
+        self._silence_timeout = notification_timeout + NOTIFICATION_SILENCE_GRACE
+        self._subscriptions: list[MonitorSubscription] = []
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Future[None] | None = None
+
+    @callback
+    def async_subscribe(
+        self,
+        client: AsyncPentairThermalWifi,
+        callback: Callable[[Notification], Awaitable[None]],
+        error_callback: Callable[[Exception], Awaitable[None]],
+        recovery_callback: CALLBACK_TYPE | None = None,
+    ) -> MonitorSubscription:
+        """Start monitoring an account for thermostat changes."""
+        subscription = MonitorSubscription(
+            client, callback, error_callback, recovery_callback
+        )
+        self._subscriptions.append(subscription)
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} monitoring"
+            )
+        else:
+            self._async_wake_up()
+        return subscription
+
+    async def async_unsubscribe(self, subscription: MonitorSubscription) -> None:
+        """Stop monitoring an account."""
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.remove(subscription)
+        if subscription.poll is not None:
+            subscription.poll.cancel()
+            try:
+                await subscription.poll
+            except (asyncio.CancelledError, Exception):
+                pass
+            subscription.poll = None
+        self._async_wake_up()
+
+    @callback
+    def _async_wake_up(self) -> None:
+        """Make the supervisor look at the subscriptions again."""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _async_run(self) -> None:
+        """Wait for notifications of all accounts until none are left."""
+        loop = self.hass.loop
+        try:
+            while self._subscriptions:
+                now = loop.time()
+                deadlines: list[float] = []
+                for subscription in list(self._subscriptions):
+                    if subscription.poll is not None:
+                        if subscription.silent_at > now:
+                            deadlines.append(subscription.silent_at)
+                            continue
+                        # The cloud neither answered nor closed the long-poll
+                        subscription.poll.cancel()
+                        subscription.poll = None
+                        await self._async_handle_error(
+                            subscription,
+                            TimeoutError("No response from the notification channel"),
+                        )
+                        if subscription not in self._subscriptions:
+                            continue
+                    if subscription.retry_at > now:
+                        deadlines.append(subscription.retry_at)
+                        continue
+                    subscription.poll = loop.create_task(
+                        self._async_poll(subscription)
+                    )
+                    subscription.silent_at = now + self._silence_timeout
+                    deadlines.append(subscription.silent_at)
+
+                self._wakeup = loop.create_future()
+                polls = {
+                    subscription.poll: subscription
+                    for subscription in self._subscriptions
+                    if subscription.poll is not None
+                }
+                done, _ = await asyncio.wait(
+                    [*polls, self._wakeup],
+                    timeout=max(0.0, min(deadlines) - now) if deadlines else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for poll in done:
+                    if (subscription := polls.get(poll)) is not None:
+                        subscription.poll = None
+                        await self._async_handle_poll(subscription, poll)
+        finally:
+            # Do not leave long-polls behind when Home Assistant stops
+            for subscription in self._subscriptions:
+                if subscription.poll is not None:
+                    subscription.poll.cancel()
+                    subscription.poll = None
+            self._task = None
+            self._wakeup = None
+
+    async def _async_poll(
+        self, subscription: MonitorSubscription
+    ) -> Notification | None:
+        """Wait for the next notification of an account."""
+        client = subscription.client
+        try:
+            return await client.wait_for_notification(
+                timeout=self._notification_timeout
+            )
+        except SessionExpiredError:
+            _LOGGER.warning("Session expired during monitoring, re-authenticating")
+            client._session_id = None
+            await client.authenticate()
+            # Notifications were missed, handle it like a reconnect
+            subscription.session_renewed = True
+            return None
+
+    async def _async_handle_poll(
+        self,
+        subscription: MonitorSubscription,
+        poll: asyncio.Task[Notification | None],
+    ) -> None:
+        """Route the result of a long-poll to its account."""
+        health = subscription.health
+        try:
+            notification = poll.result()
+        except asyncio.CancelledError:
+            return
+        except Exception as err:
+            await self._async_handle_error(subscription, err)
+            return
+
+        if health.consecutive_errors or subscription.session_renewed:
+            subscription.session_renewed = False
+            health.reconnects += 1
+            if subscription.recovery_callback:
+                subscription.recovery_callback()
+        health.consecutive_errors = 0
+        health.last_success = self.hass.loop.time()
+        if notification is not None:
+            health.notifications += 1
+            await self._async_call(subscription.callback, notification)
+
+    async def _async_handle_error(
+        self, subscription: MonitorSubscription, err: Exception
+    ) -> None:
+        """Record a failed long-poll and schedule the next one."""
+        health = subscription.health
+        health.errors += 1
+        health.consecutive_errors += 1
+        health.last_error = str(err)
+        if isinstance(err, AuthenticationError):
+            # Logging in again failed, polling again would fail as well
+            self._subscriptions.remove(subscription)
+        else:
+            self._async_schedule_restart(subscription)
+        await self._async_call(subscription.error_callback, err)
+
+    @callback
+    def _async_schedule_restart(self, subscription: MonitorSubscription) -> None:
+        """Schedule the next long-poll of an account after an error.
+
+        The delay doubles with every consecutive error, so a short blip is
+        recovered from quickly and a long outage costs few requests. Jitter
+        keeps many installations from reconnecting at the same moment.
+        """
+        health = subscription.health
+        now = self.hass.loop.time()
+        restart_times = subscription.restart_times
+        while restart_times and restart_times[0] <= now - self._restart_window:
+            restart_times.popleft()
+
+        if len(restart_times) >= self._restart_budget:
+            health.budget_exhausted += 1
+            delay = self._retry_max
+        else:
+            # The exponent is capped so a long outage cannot overflow the float
+            exponent = min(health.consecutive_errors - 1, 16)
+            delay = min(self._retry_max, self._retry_min * 2**exponent)
+        delay = delay / 2 + random.uniform(0, delay / 2)
+
+        restart_times.append(now)
+        health.restarts += 1
+        health.last_retry_delay = round(delay, 3)
+        subscription.retry_at = now + delay
+        _LOGGER.debug("Restarting monitoring in %.1f seconds", delay)
+
+    async def _async_call(
+        self, target: Callable[[_T], Awaitable[None]], argument: _T
+    ) -> None:
+        """Call an account's callback without letting it stop the supervisor."""
+        try:
+            await target(argument)
+        except Exception:
+            _LOGGER.exception("Error handling push notification")
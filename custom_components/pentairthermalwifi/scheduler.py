@@ -0,0 +1,163 @@
+"""Cloud request scheduler for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import heapq
+from itertools import count
+from typing import TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    REQUEST_BURST,
+    REQUEST_MAX_CONCURRENT,
+    REQUEST_RATE,
+    SCHEDULER,
+)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class SchedulerStats:
+    """Counters describing the requests sent through the scheduler."""
+
+    requests: int = 0
+    queued_requests: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    in_flight: int = 0
+    # Seconds requests waited for a token and a free slot
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    last_wait: float | None = None
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> RequestScheduler:
+    """Return the request scheduler shared by all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if SCHEDULER not in domain_data:
+        domain_data[SCHEDULER] = RequestScheduler(hass)
+    return domain_data[SCHEDULER]
+
+
+class RequestScheduler:
+    """Limit the rate and concurrency of the requests sent to the cloud.
+
+    Requests take a token from a bucket that refills at the configured rate
+    and holds at most the burst size, and at most the configured number of
+    requests are in flight at once. Waiting requests are started in order of
+    priority, lowest first, and in arrival order within a priority, so user
+    commands overtake background refreshes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rate: float = REQUEST_RATE,
+        burst: int = REQUEST_BURST,
+        max_concurrent: int = REQUEST_MAX_CONCURRENT,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._rate = rate
+        self._burst = burst
+        self._max_concurrent = max_concurrent
+        self._tokens = float(burst)
+        self._refilled = hass.loop.time()
+        self._in_flight = 0
+        # (priority, arrival, future resolved when the request may start)
+        self._waiting: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._arrivals = count()
+        self._dispatch_timer: asyncio.TimerHandle | None = None
+        self.stats = SchedulerStats()
+
+    async def async_run(
+        self, priority: int, target: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a request once the rate limit and the concurrency cap allow."""
+        queued = self.hass.loop.time()
+        await self._async_acquire(priority)
+
+        wait = self.hass.loop.time() - queued
+        self.stats.requests += 1
+        self.stats.total_wait += wait
+        self.stats.max_wait = max(self.stats.max_wait, wait)
+        self.stats.last_wait = round(wait, 3)
+        try:
+            return await target()
+        finally:
+            self._in_flight -= 1
+            self.stats.in_flight = self._in_flight
+            self._async_dispatch()
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Wait until a request with the priority may start."""
+        if not self._waiting and self._async_take_slot():
+            return
+
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        heapq.heappush(self._waiting, (priority, next(self._arrivals), future))
+        self.stats.queued_requests += 1
+        self._async_update_queue_depth()
+        self._async_dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the caller was cancelled
+                self._in_flight -= 1
+                self.stats.in_flight = self._in_flight
+                self._async_dispatch()
+            raise
+
+    @callback
+    def _async_take_slot(self) -> bool:
+        """Take a token and a concurrency slot if both are available."""
+        now = self.hass.loop.time()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._refilled) * self._rate
+        )
+        self._refilled = now
+        if self._in_flight >= self._max_concurrent or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._in_flight += 1
+        self.stats.in_flight = self._in_flight
+        return True
+
+    @callback
+    def _async_dispatch(self) -> None:
+        """Start the waiting requests that may start now."""
+        if self._dispatch_timer is not None:
+            self._dispatch_timer.cancel()
+            self._dispatch_timer = None
+
+        while self._waiting:
+            if self._waiting[0][2].done():
+                # The caller was cancelled while waiting
+                heapq.heappop(self._waiting)
+                continue
+            if not self._async_take_slot():
+                break
+            heapq.heappop(self._waiting)[2].set_result(None)
+        self._async_update_queue_depth()
+
+        if self._waiting and self._in_flight < self._max_concurrent:
+            # Out of tokens, try again once the next one is available
+            delay = (1 - self._tokens) / self._rate
+            self._dispatch_timer = self.hass.loop.call_later(
+                delay, self._async_dispatch
+            )
+
+    @callback
+    def _async_update_queue_depth(self) -> None:
+        """Record the number of waiting requests."""
+        self.stats.queue_depth = len(self._waiting)
+        self.stats.max_queue_depth = max(
+            self.stats.max_queue_depth, self.stats.queue_depth
+        )
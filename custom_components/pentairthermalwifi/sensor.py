@@ -1,23 +1,80 @@
 """Sensor platform for Pentair Thermal WiFi integration."""
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
+from typing import Any
 
 from pypentairthermalwifi import Thermostat
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import EntityCategory, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.typing import StateType
 
 from .const import COORDINATOR, DOMAIN
 from .coordinator import PentairThermalWiFiCoordinator
+from .entity import PentairThermalWiFiEntity, async_setup_thermostat_entities
+from .view import ThermostatView
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class PentairThermalWiFiSensorEntityDescription(SensorEntityDescription):
+    """Describes a Pentair Thermal WiFi sensor."""
+
+    value_fn: Callable[[ThermostatView], StateType]
+    available_fn: Callable[[ThermostatView], bool] = lambda view: view.online
+
+
+SENSORS: tuple[PentairThermalWiFiSensorEntityDescription, ...] = (
+    PentairThermalWiFiSensorEntityDescription(
+        key="target_temperature",
+        name="Target temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        value_fn=lambda view: view.manual_temperature,
+    ),
+    PentairThermalWiFiSensorEntityDescription(
+        key="comfort_temperature",
+        name="Comfort temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        value_fn=lambda view: view.comfort_temperature,
+    ),
+    PentairThermalWiFiSensorEntityDescription(
+        key="frost_temperature",
+        name="Frost protection temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda view: view.frost_temperature,
+    ),
+    PentairThermalWiFiSensorEntityDescription(
+        key="boost_floor_temperature",
+        name="Boost floor temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda view: view.boost_floor_temperature,
+    ),
+    PentairThermalWiFiSensorEntityDescription(
+        key="error_code",
+        name="Error code",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda view: view.error_code,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -29,95 +86,43 @@ async def async_setup_entry(
     ]
 
     # Create sensors for each thermostat
-    entities = []
-    for thermostat in coordinator.data.get_all_thermostats():
-        entities.extend([
-            PentairThermalWiFiTargetTemperatureSensor(coordinator, thermostat),
-            PentairThermalWiFiComfortTemperatureSensor(coordinator, thermostat),
-        ])
+    async_setup_thermostat_entities(
+        coordinator,
+        entry,
+        async_add_entities,
+        lambda thermostat: (
+            PentairThermalWiFiSensor(coordinator, thermostat, description)
+            for description in SENSORS
+        ),
+    )
 
-    async_add_entities(entities)
 
+class PentairThermalWiFiSensor(PentairThermalWiFiEntity, SensorEntity):
+    """Sensor for a field of a Pentair Thermal WiFi thermostat."""
 
-class PentairThermalWiFiSensorBase(CoordinatorEntity, SensorEntity):
-    """Base class for Pentair Thermal WiFi sensors."""
-
-    _attr_has_entity_name = True
+    entity_description: PentairThermalWiFiSensorEntityDescription
 
     def __init__(
         self,
         coordinator: PentairThermalWiFiCoordinator,
         thermostat: Thermostat,
-        sensor_type: str,
+        description: PentairThermalWiFiSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._serial_number = thermostat.serial_number
-        self._sensor_type = sensor_type
-        self._attr_unique_id = f"{thermostat.serial_number}_{sensor_type}"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, thermostat.serial_number)},
-            "name": thermostat.room,
-            "manufacturer": "Pentair Thermal",
-            "model": "Senz WiFi",
-            "sw_version": thermostat.sw_version,
-        }
-
-    @property
-    def _thermostat(self) -> Thermostat | None:
-        """Get the current thermostat data from coordinator."""
-        return self.coordinator.data.get_thermostat(self._serial_number)
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        if not super().available:
-            return False
-        thermostat = self._thermostat
-        return thermostat is not None and thermostat.online
-
+        super().__init__(coordinator, thermostat, description.key)
+        self.entity_description = description
 
-class PentairThermalWiFiTargetTemperatureSensor(PentairThermalWiFiSensorBase):
-    """Sensor for target temperature."""
+    def _view_available(self, view: ThermostatView) -> bool:
+        """Return if the thermostat state makes this entity available."""
+        return self.entity_description.available_fn(view)
 
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_name = "Target temperature"
-
-    def __init__(
-        self,
-        coordinator: PentairThermalWiFiCoordinator,
-        thermostat: Thermostat,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, thermostat, "target_temperature")
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        if thermostat := self._thermostat:
-            return thermostat.manual_temperature_celsius
-        return None
-
-
-class PentairThermalWiFiComfortTemperatureSensor(PentairThermalWiFiSensorBase):
-    """Sensor for comfort temperature."""
-
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_name = "Comfort temperature"
-
-    def __init__(
-        self,
-        coordinator: PentairThermalWiFiCoordinator,
-        thermostat: Thermostat,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, thermostat, "comfort_temperature")
+    def _view_fingerprint(self, view: ThermostatView) -> Any:
+        """Return the view fields that determine this entity's state."""
+        return self.entity_description.value_fn(view)
 
     @property
-    def native_value(self) -> float | None:
+    def native_value(self) -> StateType:
         """Return the state of the sensor."""
-        if thermostat := self._thermostat:
-            return thermostat.comfort_temperature_celsius
+        if view := self._view:
+            return self.entity_description.value_fn(view)
         return None
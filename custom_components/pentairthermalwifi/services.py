@@ -0,0 +1,137 @@
+"""Services for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, HVACMode
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .const import COORDINATOR, DOMAIN, SET_GROUP_MAX_CONCURRENT
+from .coordinator import PentairThermalWiFiCoordinator
+from .view import HVAC_TO_MODE
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_GROUP = "set_group"
+
+ATTR_GROUP_ID = "group_id"
+ATTR_SERIAL_NUMBERS = "serial_numbers"
+
+SET_GROUP_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive(ATTR_GROUP_ID, "target"): vol.Coerce(int),
+            vol.Exclusive(ATTR_SERIAL_NUMBERS, "target"): vol.All(
+                cv.ensure_list, [cv.string]
+            ),
+            vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Optional(ATTR_HVAC_MODE): vol.All(
+                vol.Coerce(HVACMode), vol.In(HVAC_TO_MODE)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_GROUP_ID, ATTR_SERIAL_NUMBERS),
+    cv.has_at_least_one_key(ATTR_TEMPERATURE, ATTR_HVAC_MODE),
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_set_group(call: ServiceCall) -> ServiceResponse:
+        """Set the temperature and/or HVAC mode of several thermostats at once."""
+        targets = _async_resolve_targets(hass, call.data)
+        if not targets:
+            raise ServiceValidationError("No matching thermostats found")
+
+        semaphore = asyncio.Semaphore(SET_GROUP_MAX_CONCURRENT)
+        results = await asyncio.gather(
+            *(
+                _async_set_thermostat(coordinator, serial_number, call.data, semaphore)
+                for serial_number, coordinator in targets.items()
+            )
+        )
+
+        # Reconcile every account once instead of every thermostat on its own
+        for coordinator in set(targets.values()):
+            await coordinator.async_refresh()
+
+        return {"thermostats": dict(zip(targets, results))}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_GROUP,
+        async_set_group,
+        schema=SET_GROUP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_resolve_targets(
+    hass: HomeAssistant, data: dict[str, Any]
+) -> dict[str, PentairThermalWiFiCoordinator]:
+    """Return serial number -> coordinator of the thermostats targeted by a call."""
+    targets: dict[str, PentairThermalWiFiCoordinator] = {}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is not ConfigEntryState.LOADED:
+            continue
+        coordinator: PentairThermalWiFiCoordinator = hass.data[DOMAIN][
+            entry.entry_id
+        ][COORDINATOR]
+        if not coordinator.data:
+            continue
+        for thermostat in coordinator.data.get_all_thermostats():
+            if (
+                ATTR_GROUP_ID in data and thermostat.group_id == data[ATTR_GROUP_ID]
+            ) or thermostat.serial_number in data.get(ATTR_SERIAL_NUMBERS, ()):
+                targets[thermostat.serial_number] = coordinator
+    return targets
+
+
+async def _async_set_thermostat(
+    coordinator: PentairThermalWiFiCoordinator,
+    serial_number: str,
+    data: dict[str, Any],
+    semaphore: asyncio.Semaphore,
+) -> dict[str, Any]:
+    """Send the commands of a call to one thermostat and report the outcome."""
+    async with semaphore:
+        started = time.monotonic()
+        try:
+            # Setting a temperature switches to manual mode, so the mode is set
+            # afterwards to take precedence
+            if (temperature := data.get(ATTR_TEMPERATURE)) is not None:
+                await coordinator.async_set_temperature(
+                    serial_number, temperature, await_confirmation=False
+                )
+            if (hvac_mode := data.get(ATTR_HVAC_MODE)) is not None and not (
+                temperature is not None and hvac_mode == HVACMode.HEAT
+            ):
+                await coordinator.async_set_regulation_mode(
+                    serial_number, HVAC_TO_MODE[hvac_mode], await_confirmation=False
+                )
+        except Exception as err:
+            _LOGGER.warning("Failed to update thermostat %s: %s", serial_number, err)
+            return {
+                "success": False,
+                "latency": round(time.monotonic() - started, 3),
+                "error": str(err),
+            }
+        return {"success": True, "latency": round(time.monotonic() - started, 3)}
@@ -0,0 +1,40 @@
+"""Single-flight calls for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+_T = TypeVar("_T")
+
+
+class SingleFlight(Generic[_T]):
+    """Share one in-flight call between concurrent callers with the same key.
+
+    A caller that starts a call while another call with the same key is in
+    flight waits for that call and gets its result or exception, instead of
+    starting a call of its own. Cancelling one caller does not cancel the
+    call for the others.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialize the single-flight calls."""
+        self.hass = hass
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Task[_T]] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Return True if a call with the key is in flight."""
+        return key in self._calls
+
+    async def async_call(
+        self, key: Hashable, target: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Call the target, or join the call with the same key in flight."""
+        if (task := self._calls.get(key)) is None:
+            task = self.hass.async_create_task(target(), f"{self.name} {key}")
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
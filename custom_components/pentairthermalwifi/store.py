@@ -0,0 +1,85 @@
+"""Persistent thermostat snapshot for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+from dataclasses import asdict
+import logging
+from typing import Any
+
+from pypentairthermalwifi import (
+    Day,
+    Event,
+    Group,
+    Schedule,
+    Thermostat,
+    ThermostatsResponse,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def async_get_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the thermostat snapshot of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def snapshot_to_dict(data: ThermostatsResponse) -> dict[str, Any]:
+    """Convert a thermostats response to a JSON serializable dict."""
+    return asdict(data)
+
+
+def snapshot_from_dict(data: dict[str, Any]) -> ThermostatsResponse | None:
+    """Restore a thermostats response stored by snapshot_to_dict.
+
+    Returns:
+        The thermostats response, or None if the stored data does not match
+        the current models
+    """
+    try:
+        return ThermostatsResponse(
+            groups=[
+                Group(
+                    **{
+                        **group,
+                        "thermostats": [
+                            _thermostat_from_dict(thermostat)
+                            for thermostat in group["thermostats"]
+                        ],
+                    }
+                )
+                for group in data["groups"]
+            ]
+        )
+    except (KeyError, TypeError) as err:
+        _LOGGER.debug("Ignoring incompatible thermostat snapshot: %s", err)
+        return None
+
+
+def _thermostat_from_dict(data: dict[str, Any]) -> Thermostat:
+    """Restore a thermostat stored by snapshot_to_dict."""
+    return Thermostat(
+        **{
+            **data,
+            "schedules": [
+                Schedule(
+                    number=schedule["number"],
+                    name=schedule["name"],
+                    days=[
+                        Day(
+                            week_day_grp_no=day["week_day_grp_no"],
+                            is_defined=day["is_defined"],
+                            events=[Event(**event) for event in day["events"]],
+                        )
+                        for day in schedule["days"]
+                    ],
+                )
+                for schedule in data["schedules"]
+            ],
+        }
+    )
@@ -0,0 +1,86 @@
+"""Per-thermostat view model for Pentair Thermal WiFi integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from pypentairthermalwifi import RegulationMode, Thermostat
+
+from homeassistant.components.climate import PRESET_BOOST, HVACAction, HVACMode
+
+# Map pypentairthermalwifi RegulationMode to HA HVAC modes
+MODE_TO_HVAC = {
+    RegulationMode.OFF: HVACMode.OFF,
+    RegulationMode.MANUAL: HVACMode.HEAT,
+    RegulationMode.BOOST: HVACMode.HEAT,
+    RegulationMode.SCHEDULE: HVACMode.AUTO,
+}
+
+HVAC_TO_MODE = {
+    HVACMode.OFF: RegulationMode.OFF,
+    HVACMode.HEAT: RegulationMode.MANUAL,
+    HVACMode.AUTO: RegulationMode.SCHEDULE,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ThermostatView:
+    """State exposed by the entities of a thermostat.
+
+    The coordinator builds one view whenever a thermostat changes, so the
+    entities read precomputed values instead of converting the thermostat
+    fields on every state write.
+    """
+
+    online: bool
+    heating: bool
+    current_temperature: float
+    target_temperature: float
+    manual_temperature: float
+    comfort_temperature: float
+    frost_temperature: float
+    boost_floor_temperature: float
+    min_temp: float
+    max_temp: float
+    hvac_mode: HVACMode
+    hvac_action: HVACAction
+    preset_mode: str | None
+    vacation: bool
+    error_code: int
+
+    @classmethod
+    def from_thermostat(cls, thermostat: Thermostat) -> ThermostatView:
+        """Create the view of a thermostat."""
+        # Compared as a plain int, so a mode the library does not know about
+        # is shown as off instead of failing the update of the whole account
+        regulation_mode = thermostat.regulation_mode
+        if regulation_mode == RegulationMode.BOOST:
+            target_temperature = thermostat.boost_room_temp_celsius
+        elif regulation_mode == RegulationMode.SCHEDULE:
+            target_temperature = thermostat.comfort_temperature_celsius
+        else:
+            target_temperature = thermostat.manual_temperature_celsius
+
+        if regulation_mode == RegulationMode.OFF:
+            hvac_action = HVACAction.OFF
+        elif thermostat.heating:
+            hvac_action = HVACAction.HEATING
+        else:
+            hvac_action = HVACAction.IDLE
+
+        return cls(
+            online=thermostat.online,
+            heating=thermostat.heating,
+            current_temperature=thermostat.temperature_celsius,
+            target_temperature=target_temperature,
+            manual_temperature=thermostat.manual_temperature_celsius,
+            comfort_temperature=thermostat.comfort_temperature_celsius,
+            frost_temperature=thermostat.frost_temperature_celsius,
+            boost_floor_temperature=thermostat.boost_floor_temp_celsius,
+            min_temp=thermostat.min_temp_celsius,
+            max_temp=thermostat.max_temp_celsius,
+            hvac_mode=MODE_TO_HVAC.get(regulation_mode, HVACMode.OFF),
+            hvac_action=hvac_action,
+            preset_mode=PRESET_BOOST if regulation_mode == RegulationMode.BOOST else None,
+            vacation=thermostat.vacation_enabled,
+            error_code=thermostat.error_code,
+        )
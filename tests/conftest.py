@@ -1,4 +1,5 @@
 """Test fixtures for Pentair Thermal WiFi integration."""
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -125,7 +126,19 @@ def mock_pentair_client(
 ):
     """Create a mock Pentair Thermal WiFi client."""
     client = AsyncMock()
-    client.authenticate = AsyncMock(return_value=mock_auth_response)
+
+    async def authenticate():
+        client._session_id = mock_auth_response.session_id
+        return mock_auth_response
+
+    async def wait_for_notification(timeout):
+        return await client.notifications.get()
+
+    client._session_id = None
+    # Notifications returned by the long-poll, which blocks until one is queued
+    client.notifications = asyncio.Queue()
+    client.wait_for_notification = AsyncMock(side_effect=wait_for_notification)
+    client.authenticate = AsyncMock(side_effect=authenticate)
     client.get_thermostats = AsyncMock(return_value=mock_thermostats_response)
     client.get_thermostat = AsyncMock(return_value=mock_thermostat)
     client.update_thermostat = AsyncMock(return_value=mock_update_response)
@@ -31,6 +31,11 @@ async def test_binary_sensor_entities(
     assert connectivity_state.state == "on"  # online=True in mock
     assert connectivity_state.attributes["device_class"] == "connectivity"
 
+    # Test vacation binary sensor
+    vacation_state = hass.states.get("binary_sensor.living_room_vacation")
+    assert vacation_state
+    assert vacation_state.state == "off"  # vacation_enabled=False in mock
+
 
 async def test_heating_sensor_off_when_not_heating(
     hass: HomeAssistant, mock_config_entry, mock_pentair_client, mock_thermostat
@@ -2,7 +2,7 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from pypentairthermalwifi import RegulationMode
+from pypentairthermalwifi import APIError, RegulationMode
 
 from homeassistant.components.climate import (
     ATTR_HVAC_MODE,
@@ -18,7 +18,7 @@ from homeassistant.components.climate import (
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.core import HomeAssistant
 
-from custom_components.pentairthermalwifi.const import DOMAIN
+from custom_components.pentairthermalwifi.const import COORDINATOR, DOMAIN
 
 
 async def test_climate_entity_state(
@@ -140,6 +140,42 @@ async def test_set_temperature(
         "1234567", 22.5
     )
 
+    # The new setpoint is shown right away without refreshing the account
+    state = hass.states.get(entity_id)
+    assert state.attributes["temperature"] == 22.5
+    mock_pentair_client.get_thermostats.assert_called_once()
+
+
+async def test_set_temperature_failure_rolls_back(
+    hass: HomeAssistant, mock_config_entry, mock_pentair_client
+) -> None:
+    """Test the optimistic setpoint is rolled back when the command fails."""
+    mock_pentair_client.set_manual_temperature.side_effect = APIError("API Error")
+    mock_config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    entity_id = "climate.living_room"
+
+    with pytest.raises(APIError):
+        await hass.services.async_call(
+            CLIMATE_DOMAIN,
+            SERVICE_SET_TEMPERATURE,
+            {
+                ATTR_ENTITY_ID: entity_id,
+                ATTR_TEMPERATURE: 22.5,
+            },
+            blocking=True,
+        )
+
+    state = hass.states.get(entity_id)
+    assert state.attributes["temperature"] == 21.0
+
 
 async def test_set_hvac_mode_off(
     hass: HomeAssistant, mock_config_entry, mock_pentair_client
@@ -204,6 +240,34 @@ async def test_set_hvac_mode_auto(
     assert call_args[0][1].regulation_mode == RegulationMode.SCHEDULE
 
 
+async def test_set_hvac_mode_unchanged(
+    hass: HomeAssistant, mock_config_entry, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test setting the current HVAC mode sends nothing."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {
+            ATTR_ENTITY_ID: "climate.living_room",
+            ATTR_HVAC_MODE: HVACMode.HEAT,
+        },
+        blocking=True,
+    )
+
+    mock_pentair_client.update_thermostat.assert_not_called()
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR]
+    assert coordinator.stats.skipped_commands == 1
+
+
 async def test_set_preset_mode_boost(
     hass: HomeAssistant, mock_config_entry, mock_pentair_client, mock_thermostat
 ) -> None:
@@ -0,0 +1,60 @@
+"""Test the Pentair Thermal WiFi command queue."""
+import asyncio
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.pentairthermalwifi.command_queue import ThermostatCommandQueue
+
+
+async def test_command_queue_merges_setpoints_in_order(hass: HomeAssistant) -> None:
+    """Test queued setpoints are merged and ordered against other commands."""
+    queue = ThermostatCommandQueue(hass, "1234567")
+    release = asyncio.Event()
+    sent: list[str] = []
+
+    def command(name: str):
+        async def send() -> None:
+            sent.append(name)
+            await release.wait()
+
+        return send
+
+    first, merged = queue.async_enqueue(command("21.0"), "temperature")
+    assert not merged
+    await asyncio.sleep(0)
+
+    # The first setpoint is in flight, the next ones are queued behind it
+    second, merged = queue.async_enqueue(command("21.5"), "temperature")
+    assert not merged
+    third, merged = queue.async_enqueue(command("22.0"), "temperature")
+    assert merged
+    assert third is second
+    off, merged = queue.async_enqueue(command("off"))
+    assert not merged
+    fourth, merged = queue.async_enqueue(command("23.0"), "temperature")
+    assert not merged
+
+    release.set()
+    await asyncio.gather(first, second, off, fourth)
+
+    assert sent == ["21.0", "22.0", "off", "23.0"]
+
+
+async def test_command_queue_failure_reaches_caller(hass: HomeAssistant) -> None:
+    """Test a failing command fails its future and the queue keeps going."""
+    queue = ThermostatCommandQueue(hass, "1234567")
+
+    async def fail() -> None:
+        raise ValueError("boom")
+
+    async def succeed() -> None:
+        pass
+
+    failed, _ = queue.async_enqueue(fail)
+    succeeded, _ = queue.async_enqueue(succeed)
+
+    with pytest.raises(ValueError):
+        await failed
+    await succeeded
@@ -1,11 +1,17 @@
 """Test the Pentair Thermal WiFi coordinator."""
-from unittest.mock import AsyncMock
+import asyncio
+from copy import deepcopy
+from dataclasses import replace
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from pypentairthermalwifi import APIError
+from pypentairthermalwifi import APIError, Notification, RegulationMode
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.pentairthermalwifi.coordinator import (
     PentairThermalWiFiCoordinator,
@@ -46,3 +52,623 @@ async def test_coordinator_push_notifications(
 
     # Verify no polling interval is set (we use push notifications)
     assert coordinator.update_interval is None
+
+
+async def test_coordinator_falls_back_to_polling(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test the coordinator polls while push notifications are unavailable."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    await coordinator._handle_error(APIError("Connection lost"))
+    await coordinator._handle_error(APIError("Connection lost"))
+    await hass.async_block_till_done()
+
+    assert coordinator.update_mode == "poll"
+    assert coordinator.stats.push_to_poll_transitions == 1
+    # The missed changes are fetched right away
+    assert mock_pentair_client.get_thermostats.call_count == 2
+    assert coordinator.last_update_success is True
+
+    # Polls that find no change back off
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=120)
+
+    await coordinator._handle_notification(
+        Notification(sequence_nr=1, action=1, thermostat=mock_thermostat)
+    )
+    assert coordinator.update_mode == "push"
+    assert coordinator.update_interval is None
+    assert coordinator.stats.poll_to_push_transitions == 1
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_thermostat_index(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test thermostats are resolved through the serial number index."""
+    coordinator = PentairThermalWiFiCoordinator(hass, mock_pentair_client)
+
+    assert coordinator.get_thermostat("1234567") is None
+
+    await coordinator.async_refresh()
+
+    assert coordinator.get_thermostat("1234567") is mock_thermostat
+    assert coordinator.get_thermostat("unknown") is None
+
+
+async def test_coordinator_notification_patches_index(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a notification replaces the cached thermostat and its index entry."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    updated = replace(mock_thermostat, temperature=2300)
+    await coordinator._handle_notification(
+        Notification(sequence_nr=1, action=0, thermostat=updated)
+    )
+
+    assert coordinator.get_thermostat("1234567") is updated
+    assert coordinator.data.groups[0].thermostats[0] is updated
+
+
+async def test_coordinator_snapshots_share_unchanged_data(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test updates publish new snapshots without changing older ones."""
+    other = replace(mock_thermostat, serial_number="7654321", group_id=2)
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+    coordinator._insert_thermostat(other)
+    previous = coordinator.data
+    generation = coordinator.generation
+
+    updated = replace(mock_thermostat, temperature=2300)
+    await coordinator._handle_notification(
+        Notification(sequence_nr=1, action=0, thermostat=updated)
+    )
+
+    assert coordinator.generation == generation + 1
+    assert previous.groups[0].thermostats[0] is mock_thermostat
+    assert coordinator.data.groups[0].thermostats[0] is updated
+    assert coordinator.data.groups[1] is previous.groups[1]
+
+    # A refresh shares the thermostats whose content did not change
+    mock_pentair_client.get_thermostats.return_value = deepcopy(coordinator.data)
+    await coordinator.async_refresh()
+    assert coordinator.get_thermostat("1234567") is updated
+    assert coordinator.get_thermostat("7654321") is other
+
+
+async def test_coordinator_notification_targets_device_listeners(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a notification only updates the listeners of that thermostat."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    device_listener = MagicMock()
+    other_listener = MagicMock()
+    account_listener = MagicMock()
+    coordinator.async_add_listener(device_listener, "1234567")
+    remove_other = coordinator.async_add_listener(other_listener, "7654321")
+    coordinator.async_add_listener(account_listener)
+    mock_pentair_client.get_thermostats.return_value = deepcopy(coordinator.data)
+
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=1,
+            action=0,
+            thermostat=replace(mock_thermostat, temperature=2300),
+        )
+    )
+
+    device_listener.assert_called_once()
+    other_listener.assert_not_called()
+    account_listener.assert_not_called()
+
+    # A full refresh only updates the listeners of changed thermostats
+    await coordinator.async_refresh()
+    assert device_listener.call_count == 2
+    other_listener.assert_not_called()
+    account_listener.assert_called_once()
+    assert coordinator.last_refresh_changes.changed == {"1234567"}
+
+    # Nothing is updated when the refresh finds no change
+    await coordinator.async_refresh()
+    assert device_listener.call_count == 2
+    account_listener.assert_called_once()
+    assert coordinator.stats.incremental_refreshes == 2
+
+    remove_other()
+    assert "7654321" not in coordinator._device_listeners
+
+
+async def test_coordinator_coalesces_notification_burst(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a burst of notifications is merged into a single dispatch."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=1, coalesce_max_latency=5
+    )
+    await coordinator.async_refresh()
+
+    listener = MagicMock()
+    coordinator.async_add_listener(listener, "1234567")
+
+    for sequence_nr, temperature in enumerate((2200, 2250, 2300)):
+        await coordinator._handle_notification(
+            Notification(
+                sequence_nr=sequence_nr,
+                action=0,
+                thermostat=replace(mock_thermostat, temperature=temperature),
+            )
+        )
+
+    listener.assert_not_called()
+    assert coordinator.get_thermostat("1234567") is mock_thermostat
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    listener.assert_called_once()
+    assert coordinator.get_thermostat("1234567").temperature == 2300
+    assert coordinator.stats.notifications == 3
+    assert coordinator.stats.coalesced_notifications == 2
+
+
+async def test_coordinator_optimistic_command_reconciles_with_push(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test an optimistic update is replaced by the cloud state on the next push."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    await coordinator.async_send_command(
+        "1234567",
+        {"regulation_mode": RegulationMode.SCHEDULE},
+        AsyncMock(),
+    )
+
+    assert coordinator.get_thermostat("1234567").regulation_mode == (
+        RegulationMode.SCHEDULE
+    )
+    mock_pentair_client.get_thermostats.assert_called_once()
+
+    # The cloud reports the mode was not applied
+    await coordinator._handle_notification(
+        Notification(sequence_nr=1, action=0, thermostat=mock_thermostat)
+    )
+
+    assert coordinator.get_thermostat("1234567").regulation_mode == (
+        RegulationMode.MANUAL
+    )
+    assert coordinator.stats.optimistic_updates == 1
+    assert coordinator.stats.command_rollbacks == 1
+
+
+async def test_coordinator_mode_write_keeps_pushed_fields(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a queued mode change is written on top of the latest pushed state."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    release = asyncio.Event()
+
+    async def turn_off(serial_number: str) -> None:
+        await release.wait()
+
+    mock_pentair_client.turn_off.side_effect = turn_off
+    turn_off = hass.async_create_task(
+        coordinator.async_set_regulation_mode(
+            "1234567", RegulationMode.OFF, await_confirmation=False
+        )
+    )
+    set_schedule = hass.async_create_task(
+        coordinator.async_set_regulation_mode(
+            "1234567", RegulationMode.SCHEDULE, await_confirmation=False
+        )
+    )
+    await asyncio.sleep(0)
+
+    # Pushed while the mode change waits behind the first command
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=1,
+            action=0,
+            thermostat=replace(
+                mock_thermostat,
+                regulation_mode=RegulationMode.OFF,
+                manual_temperature=2300,
+            ),
+        )
+    )
+    release.set()
+    await asyncio.gather(turn_off, set_schedule)
+
+    sent = mock_pentair_client.update_thermostat.call_args[0][1]
+    assert sent.regulation_mode == RegulationMode.SCHEDULE
+    assert sent.manual_temperature == 2300
+    assert mock_thermostat.regulation_mode == RegulationMode.MANUAL
+
+
+async def test_coordinator_mode_write_skips_unsent_optimistic_fields(
+    hass: HomeAssistant, mock_pentair_client
+) -> None:
+    """Test a mode write does not send the values of commands queued after it."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    release = asyncio.Event()
+
+    async def set_manual_temperature(serial_number: str, temperature: float) -> None:
+        if temperature == 23.0:
+            await release.wait()
+
+    mock_pentair_client.set_manual_temperature.side_effect = set_manual_temperature
+    tasks = [
+        hass.async_create_task(
+            coordinator.async_set_temperature(
+                "1234567", 23.0, await_confirmation=False
+            )
+        ),
+        hass.async_create_task(
+            coordinator.async_set_regulation_mode(
+                "1234567", RegulationMode.SCHEDULE, await_confirmation=False
+            )
+        ),
+        hass.async_create_task(
+            coordinator.async_set_temperature(
+                "1234567", 25.0, await_confirmation=False
+            )
+        ),
+    ]
+    await asyncio.sleep(0)
+    assert coordinator.get_thermostat("1234567").manual_temperature == 2500
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    sent = mock_pentair_client.update_thermostat.call_args[0][1]
+    assert sent.regulation_mode == RegulationMode.SCHEDULE
+    assert sent.manual_temperature == 2100
+
+
+async def test_coordinator_merged_command_rolls_back_to_sent_state(
+    hass: HomeAssistant, mock_pentair_client
+) -> None:
+    """Test a failed merged command rolls back to the last state sent."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    release = asyncio.Event()
+
+    async def set_manual_temperature(serial_number: str, temperature: float) -> None:
+        if temperature == 20.0:
+            await release.wait()
+            return
+        raise APIError("API Error")
+
+    mock_pentair_client.set_manual_temperature.side_effect = set_manual_temperature
+    tasks = []
+    for temperature in (20.0, 21.0, 22.0):
+        tasks.append(
+            hass.async_create_task(
+                coordinator.async_set_temperature(
+                    "1234567", temperature, await_confirmation=False
+                )
+            )
+        )
+        await asyncio.sleep(0)
+    assert coordinator.stats.merged_commands == 1
+
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert results[0] is None
+    assert isinstance(results[2], APIError)
+    # 21.0 was never sent, the cloud is at 20.0
+    assert coordinator.get_thermostat("1234567").manual_temperature == 2000
+    mock_pentair_client.set_manual_temperature.assert_called_with("1234567", 22.0)
+
+
+async def test_coordinator_command_confirmed_by_push(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a command completes on the matching push without any refresh."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    await coordinator.async_send_command(
+        "1234567", {"manual_temperature": 2300}, AsyncMock()
+    )
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=1,
+            action=0,
+            thermostat=replace(mock_thermostat, manual_temperature=2300),
+        )
+    )
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=60))
+    await hass.async_block_till_done()
+
+    assert coordinator.stats.commands_confirmed == 1
+    assert coordinator.stats.command_timeouts == 0
+    assert coordinator.stats.last_command_latency is not None
+    mock_pentair_client.get_thermostats.assert_called_once()
+
+
+async def test_coordinator_command_timeout_refreshes(
+    hass: HomeAssistant, mock_pentair_client
+) -> None:
+    """Test a command without push confirmation refreshes only that thermostat."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, command_timeout=5
+    )
+    await coordinator.async_refresh()
+
+    await coordinator.async_send_command(
+        "1234567", {"manual_temperature": 2300}, AsyncMock()
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+
+    assert coordinator.stats.command_timeouts == 1
+    assert coordinator.stats.targeted_refreshes == 1
+    mock_pentair_client.get_thermostat.assert_called_once_with("1234567")
+    mock_pentair_client.get_thermostats.assert_called_once()
+
+
+async def test_coordinator_refresh_thermostat(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test refreshing one thermostat patches the cache and notifies its entities."""
+    coordinator = PentairThermalWiFiCoordinator(hass, mock_pentair_client)
+    await coordinator.async_refresh()
+
+    device_listener = MagicMock()
+    account_listener = MagicMock()
+    coordinator.async_add_listener(device_listener, "1234567")
+    coordinator.async_add_listener(account_listener)
+
+    updated = replace(mock_thermostat, temperature=2300)
+    mock_pentair_client.get_thermostat.return_value = updated
+    await coordinator.async_refresh_thermostat("1234567")
+
+    assert coordinator.get_thermostat("1234567") is updated
+    device_listener.assert_called_once()
+    account_listener.assert_not_called()
+
+
+async def test_coordinator_notification_for_unknown_thermostat(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a notification for an unknown serial refreshes and adds that thermostat."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    new_thermostat = replace(
+        mock_thermostat, serial_number="7654321", room="Kitchen", group_id=2
+    )
+    mock_pentair_client.get_thermostat.return_value = new_thermostat
+    await coordinator._handle_notification(
+        Notification(sequence_nr=1, action=0, thermostat=new_thermostat)
+    )
+    await hass.async_block_till_done()
+
+    mock_pentair_client.get_thermostat.assert_called_once_with("7654321")
+    mock_pentair_client.get_thermostats.assert_called_once()
+    assert coordinator.get_thermostat("7654321") is new_thermostat
+    assert coordinator.data.groups[1].thermostats == [new_thermostat]
+
+
+async def test_coordinator_drops_out_of_order_notification(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a notification older than the last one accepted is dropped."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=5,
+            action=0,
+            thermostat=replace(mock_thermostat, temperature=2300),
+        )
+    )
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=4,
+            action=0,
+            thermostat=replace(mock_thermostat, temperature=2200),
+        )
+    )
+
+    assert coordinator.get_thermostat("1234567").temperature == 2300
+    assert coordinator.stats.stale_notifications == 1
+
+
+async def test_coordinator_accepts_notifications_of_new_session(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test sequence numbers restart when the client logged in again."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=5,
+            action=0,
+            thermostat=replace(mock_thermostat, temperature=2300),
+        )
+    )
+    # Logged in again while fetching, without a reconnect of the push channel
+    mock_pentair_client._session_id = "test_session_456"
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=1,
+            action=0,
+            thermostat=replace(mock_thermostat, temperature=2200),
+        )
+    )
+
+    assert coordinator.get_thermostat("1234567").temperature == 2200
+    assert coordinator.stats.stale_notifications == 0
+
+
+async def test_coordinator_refresh_keeps_newer_notification(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a refresh does not overwrite a notification received meanwhile."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=0
+    )
+    await coordinator.async_refresh()
+
+    fetched = deepcopy(coordinator.data)
+    release = asyncio.Event()
+
+    async def get_thermostats():
+        await release.wait()
+        return fetched
+
+    mock_pentair_client.get_thermostats.side_effect = get_thermostats
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    # The notification arrives after the request was sent
+    while mock_pentair_client.get_thermostats.await_count < 2:
+        await asyncio.sleep(0)
+
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=1,
+            action=0,
+            thermostat=replace(mock_thermostat, temperature=2300),
+        )
+    )
+    release.set()
+    await refresh
+
+    assert coordinator.get_thermostat("1234567").temperature == 2300
+    assert coordinator.stats.stale_refresh_results == 1
+
+
+async def test_coordinator_joined_refresh_keeps_newer_notification(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a refresh joining a fetch uses the version of that fetch."""
+    coordinator = PentairThermalWiFiCoordinator(
+        hass, mock_pentair_client, coalesce_window=1
+    )
+    await coordinator.async_refresh()
+
+    fetched = deepcopy(coordinator.data)
+    release = asyncio.Event()
+
+    async def get_thermostats():
+        await release.wait()
+        return fetched
+
+    mock_pentair_client.get_thermostats.side_effect = get_thermostats
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    while mock_pentair_client.get_thermostats.await_count < 2:
+        await asyncio.sleep(0)
+
+    # Pushed while the fetch runs, and still in the coalescing window when a
+    # second refresh joins the fetch
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=1,
+            action=0,
+            thermostat=replace(mock_thermostat, temperature=2900),
+        )
+    )
+    joined = hass.async_create_task(coordinator._async_update_data())
+    await asyncio.sleep(0)
+    release.set()
+    await refresh
+    published = coordinator.data
+    await joined
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    assert coordinator.get_thermostat("1234567").temperature == 2900
+    assert coordinator.stats.stale_notifications == 0
+    assert mock_pentair_client.get_thermostats.await_count == 2
+    # The joined refresh did not change the snapshot already published
+    assert published.groups[0].thermostats[0].temperature == 2150
+
+
+async def test_coordinator_deduplicates_concurrent_refreshes(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostats_response
+) -> None:
+    """Test concurrent refreshes share one request per scope."""
+    coordinator = PentairThermalWiFiCoordinator(hass, mock_pentair_client)
+    await coordinator.async_refresh()
+    mock_pentair_client.get_thermostats.reset_mock()
+
+    release = asyncio.Event()
+
+    async def get_thermostat(serial_number):
+        await release.wait()
+        return coordinator.get_thermostat(serial_number)
+
+    mock_pentair_client.get_thermostat.side_effect = get_thermostat
+    refreshes = asyncio.gather(
+        coordinator.async_refresh_thermostat("1234567"),
+        coordinator.async_refresh_thermostat("1234567"),
+    )
+    await asyncio.sleep(0)
+    release.set()
+    await refreshes
+
+    mock_pentair_client.get_thermostat.assert_called_once_with("1234567")
+    assert coordinator.stats.deduplicated_thermostat_refreshes == 1
+
+    async def get_thermostats():
+        await release.wait()
+        return mock_thermostats_response
+
+    release.clear()
+    mock_pentair_client.get_thermostats.side_effect = get_thermostats
+    refreshes = asyncio.gather(
+        coordinator.async_refresh(),
+        coordinator.async_refresh(),
+        coordinator.async_refresh_thermostat("1234567"),
+    )
+    await asyncio.sleep(0)
+    release.set()
+    await refreshes
+
+    mock_pentair_client.get_thermostats.assert_called_once()
+    mock_pentair_client.get_thermostat.assert_called_once()
+    assert coordinator.stats.deduplicated_refreshes == 1
+    assert coordinator.stats.deduplicated_thermostat_refreshes == 2
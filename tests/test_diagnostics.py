@@ -0,0 +1,64 @@
+"""Test the Pentair Thermal WiFi diagnostics."""
+from dataclasses import replace
+from datetime import timedelta
+from unittest.mock import patch
+
+from pypentairthermalwifi import Notification
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.pentairthermalwifi.const import COORDINATOR, DOMAIN
+from custom_components.pentairthermalwifi.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_diagnostics_state_write_counters(
+    hass: HomeAssistant, mock_config_entry, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test unchanged entities skip their state write and are counted."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR]
+
+    # A field no entity exposes changes: every entity skips its write
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=1,
+            action=0,
+            thermostat=replace(mock_thermostat, icon_id=2),
+        )
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    assert diagnostics["thermostat_count"] == 1
+    assert diagnostics["stats"]["state_writes"] == 0
+    assert diagnostics["stats"]["suppressed_state_writes"] == 9
+
+    # The room temperature changes: only the climate entity writes
+    await coordinator._handle_notification(
+        Notification(
+            sequence_nr=2,
+            action=0,
+            thermostat=replace(mock_thermostat, temperature=2300),
+        )
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    assert diagnostics["stats"]["state_writes"] == 1
+    assert diagnostics["stats"]["suppressed_state_writes"] == 17
+    state = hass.states.get("climate.living_room")
+    assert state.attributes["current_temperature"] == 23.0
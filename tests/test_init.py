@@ -1,14 +1,25 @@
 """Test the Pentair Thermal WiFi integration init."""
+import asyncio
+from dataclasses import replace
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from pypentairthermalwifi import AuthenticationError
+from pypentairthermalwifi import AuthenticationError, ThermostatsResponse
 
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
 
-from custom_components.pentairthermalwifi.const import DOMAIN
+from custom_components.pentairthermalwifi.api import async_get_http_client
+from custom_components.pentairthermalwifi.const import (
+    CONF_SESSION_ID,
+    COORDINATOR,
+    DOMAIN,
+    REQUEST_TIMEOUT,
+)
+from custom_components.pentairthermalwifi.store import snapshot_to_dict
 
 
 async def test_setup_entry(
@@ -16,18 +27,40 @@ async def test_setup_entry(
 ) -> None:
     """Test successful setup."""
     mock_config_entry.add_to_hass(hass)
+    forward_entry_setups = hass.config_entries.async_forward_entry_setups
+    monitoring_at_forward: list[bool] = []
+
+    async def async_forward_entry_setups(entry, platforms) -> None:
+        coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+        monitoring_at_forward.append(coordinator.monitor_health is not None)
+        await forward_entry_setups(entry, platforms)
 
     with patch(
         "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
         return_value=mock_pentair_client,
+    ), patch.object(
+        hass.config_entries,
+        "async_forward_entry_setups",
+        async_forward_entry_setups,
     ):
         assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
         await hass.async_block_till_done()
 
     assert mock_config_entry.state == ConfigEntryState.LOADED
+    # Monitoring was subscribed before the platforms were set up
+    assert monitoring_at_forward == [True]
     assert DOMAIN in hass.data
     assert mock_config_entry.entry_id in hass.data[DOMAIN]
 
+    # Verify the setup phases were timed
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR]
+    assert set(coordinator.stats.setup_phases) == {
+        "load_snapshot",
+        "authenticate",
+        "first_refresh",
+        "platforms",
+    }
+
     # Verify client methods were called
     mock_pentair_client.authenticate.assert_called_once()
 
@@ -51,7 +84,7 @@ async def test_setup_entry_auth_failed(
         result = await hass.config_entries.async_setup(mock_config_entry.entry_id)
         assert result is False
 
-    mock_client.close.assert_called_once()
+    assert mock_client._client is None
 
 
 async def test_unload_entry(
@@ -69,6 +102,10 @@ async def test_unload_entry(
 
     assert mock_config_entry.state == ConfigEntryState.LOADED
 
+    # Verify the client uses the shared HTTP client with the request timeout
+    assert mock_pentair_client._client is async_get_http_client(hass)
+    assert mock_pentair_client._client.timeout.read == REQUEST_TIMEOUT
+
     # Unload the entry
     assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
     await hass.async_block_till_done()
@@ -76,5 +113,180 @@ async def test_unload_entry(
     assert mock_config_entry.state == ConfigEntryState.NOT_LOADED
     assert mock_config_entry.entry_id not in hass.data[DOMAIN]
 
-    # Verify client was closed
-    mock_pentair_client.close.assert_called_once()
+    # Verify the client was released without closing the shared HTTP client
+    assert mock_pentair_client._client is None
+    mock_pentair_client.close.assert_not_called()
+
+
+async def test_thermostats_added_and_removed(
+    hass: HomeAssistant, mock_config_entry, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test entities follow the thermostats of the account without a reload."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR]
+    device_registry = dr.async_get(hass)
+    kitchen = replace(mock_thermostat, serial_number="7654321", room="Kitchen")
+
+    # A thermostat pushed for the first time is fetched and added
+    mock_pentair_client.get_thermostat.return_value = kitchen
+    await coordinator.async_refresh_thermostat("7654321")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("climate.kitchen")
+    assert hass.states.get("sensor.kitchen_target_temperature")
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "7654321")})
+
+    # A thermostat missing from a refresh becomes unavailable
+    mock_pentair_client.get_thermostats.return_value = ThermostatsResponse(
+        groups=[replace(coordinator.data.groups[0], thermostats=[kitchen])]
+    )
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("climate.living_room").state == STATE_UNAVAILABLE
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "1234567")})
+
+    # and is removed with its entities once missing from the next refresh too
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("climate.living_room") is None
+    assert hass.states.get("binary_sensor.living_room_heating") is None
+    assert not device_registry.async_get_device(identifiers={(DOMAIN, "1234567")})
+    assert hass.states.get("climate.kitchen")
+    assert mock_config_entry.state == ConfigEntryState.LOADED
+
+
+async def test_empty_refresh_keeps_devices(
+    hass: HomeAssistant, mock_config_entry, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test a response without any thermostat does not remove the devices."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR]
+    device_registry = dr.async_get(hass)
+    response = mock_pentair_client.get_thermostats.return_value
+
+    mock_pentair_client.get_thermostats.return_value = ThermostatsResponse(groups=[])
+    for _ in range(3):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "1234567")})
+    assert hass.states.get("climate.living_room").state == STATE_UNAVAILABLE
+
+    # The thermostat comes back with the entities it had
+    mock_pentair_client.get_thermostats.return_value = response
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("climate.living_room").state != STATE_UNAVAILABLE
+    assert len(hass.states.async_entity_ids("climate")) == 1
+
+
+async def test_setup_entry_from_snapshot(
+    hass: HomeAssistant,
+    hass_storage,
+    mock_config_entry,
+    mock_pentair_client,
+    mock_auth_response,
+    mock_thermostats_response,
+) -> None:
+    """Test entities are created from the snapshot before the cloud responds."""
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {"snapshot": snapshot_to_dict(mock_thermostats_response)},
+    }
+    mock_config_entry.add_to_hass(hass)
+
+    connected = asyncio.Event()
+    monitoring = asyncio.Event()
+
+    async def authenticate():
+        await connected.wait()
+        return mock_auth_response
+
+    async def wait_for_notification(timeout):
+        monitoring.set()
+        return await asyncio.Event().wait()
+
+    mock_pentair_client.authenticate.side_effect = authenticate
+    mock_pentair_client.wait_for_notification.side_effect = wait_for_notification
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_config_entry.state == ConfigEntryState.LOADED
+        state = hass.states.get("climate.living_room")
+        assert state
+        assert state.attributes["current_temperature"] == 21.5
+        assert state.attributes["assumed_state"] is True
+        mock_pentair_client.get_thermostats.assert_not_called()
+
+        connected.set()
+        await asyncio.wait_for(monitoring.wait(), 1)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("climate.living_room")
+    assert "assumed_state" not in state.attributes
+    mock_pentair_client.get_thermostats.assert_called_once()
+    mock_pentair_client.wait_for_notification.assert_called_once()
+
+
+async def test_setup_entry_stores_session(
+    hass: HomeAssistant, mock_config_entry, mock_pentair_client
+) -> None:
+    """Test the session of a fresh login is stored in the config entry."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.data[CONF_SESSION_ID] == "test_session_123"
+
+
+async def test_setup_entry_reuses_session(
+    hass: HomeAssistant, mock_config_entry, mock_pentair_client
+) -> None:
+    """Test a stored session is reused instead of logging in again."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={**mock_config_entry.data, CONF_SESSION_ID: "stored_session"},
+    )
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state == ConfigEntryState.LOADED
+    mock_pentair_client.authenticate.assert_not_called()
+    assert mock_pentair_client._session_id == "stored_session"
+    mock_pentair_client.get_thermostats.assert_called_once()
@@ -0,0 +1,119 @@
+"""Test the Pentair Thermal WiFi monitoring supervisor."""
+import asyncio
+from unittest.mock import AsyncMock
+
+from pypentairthermalwifi import APIError, Notification
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.pentairthermalwifi.monitor import (
+    MonitoringSupervisor,
+    MonitorSubscription,
+)
+
+
+def _mock_client() -> AsyncMock:
+    """Create a client whose long-poll returns the queued notifications."""
+    client = AsyncMock()
+    client.notifications = asyncio.Queue()
+
+    async def wait_for_notification(timeout):
+        result = await client.notifications.get()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    client.wait_for_notification.side_effect = wait_for_notification
+    return client
+
+
+async def _wait_until_called(mock: AsyncMock) -> None:
+    """Let the supervisor run until the mock has been called."""
+    async with asyncio.timeout(1):
+        while not mock.called:
+            await asyncio.sleep(0)
+
+
+async def test_routes_notifications_to_account(
+    hass: HomeAssistant, mock_thermostat
+) -> None:
+    """Test notifications of several accounts are handled by one task."""
+    supervisor = MonitoringSupervisor(hass)
+    first, second = _mock_client(), _mock_client()
+    first_callback, second_callback = AsyncMock(), AsyncMock()
+    first_subscription = supervisor.async_subscribe(
+        first, callback=first_callback, error_callback=AsyncMock()
+    )
+    second_subscription = supervisor.async_subscribe(
+        second, callback=second_callback, error_callback=AsyncMock()
+    )
+
+    notification = Notification(sequence_nr=1, action=1, thermostat=mock_thermostat)
+    second.notifications.put_nowait(notification)
+    await _wait_until_called(second_callback)
+
+    first_callback.assert_not_called()
+    second_callback.assert_called_once_with(notification)
+    assert second_subscription.health.notifications == 1
+    assert first_subscription.health.notifications == 0
+
+    await supervisor.async_unsubscribe(first_subscription)
+    await supervisor.async_unsubscribe(second_subscription)
+    await asyncio.sleep(0)
+    assert supervisor._task is None
+
+
+async def test_retries_after_error(hass: HomeAssistant, mock_thermostat) -> None:
+    """Test an error is reported and the account is polled again."""
+    supervisor = MonitoringSupervisor(hass, retry_min=0)
+    client = _mock_client()
+    callback, error_callback = AsyncMock(), AsyncMock()
+    subscription = supervisor.async_subscribe(
+        client, callback=callback, error_callback=error_callback
+    )
+
+    client.notifications.put_nowait(APIError("Connection lost"))
+    notification = Notification(sequence_nr=1, action=1, thermostat=mock_thermostat)
+    client.notifications.put_nowait(notification)
+    await _wait_until_called(callback)
+
+    error_callback.assert_called_once()
+    callback.assert_called_once_with(notification)
+    assert subscription.health.errors == 1
+    assert subscription.health.consecutive_errors == 0
+    assert subscription.health.reconnects == 1
+
+    await supervisor.async_unsubscribe(subscription)
+    await hass.async_block_till_done()
+
+
+async def test_restart_backoff(hass: HomeAssistant) -> None:
+    """Test restarts back off exponentially with jitter within a budget."""
+    supervisor = MonitoringSupervisor(
+        hass, retry_min=1, retry_max=32, restart_budget=3
+    )
+    subscription = MonitorSubscription(_mock_client(), AsyncMock(), AsyncMock())
+    health = subscription.health
+
+    for errors, delay in ((1, 1), (2, 2), (3, 4)):
+        health.consecutive_errors = errors
+        supervisor._async_schedule_restart(subscription)
+        assert delay / 2 <= health.last_retry_delay <= delay
+
+    # The restart budget is used up, retry at the maximum delay
+    health.consecutive_errors = 4
+    supervisor._async_schedule_restart(subscription)
+    assert 16 <= health.last_retry_delay <= 32
+    assert health.restarts == 4
+    assert health.budget_exhausted == 1
+
+
+async def test_restart_backoff_long_outage(hass: HomeAssistant) -> None:
+    """Test the delay stays at the maximum after very many errors."""
+    supervisor = MonitoringSupervisor(hass, retry_min=1, retry_max=300)
+    subscription = MonitorSubscription(_mock_client(), AsyncMock(), AsyncMock())
+    subscription.health.consecutive_errors = 1100
+
+    supervisor._async_schedule_restart(subscription)
+
+    assert 150 <= subscription.health.last_retry_delay <= 300
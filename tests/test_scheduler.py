@@ -0,0 +1,62 @@
+"""Test the Pentair Thermal WiFi request scheduler."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.pentairthermalwifi.const import (
+    PRIORITY_COMMAND,
+    PRIORITY_REFRESH,
+)
+from custom_components.pentairthermalwifi.scheduler import RequestScheduler
+
+
+async def test_commands_run_before_refreshes(hass: HomeAssistant) -> None:
+    """Test waiting requests start in order of priority."""
+    scheduler = RequestScheduler(hass, rate=100, burst=10, max_concurrent=1)
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def request(name: str) -> str:
+        started.append(name)
+        await release.wait()
+        return name
+
+    first = hass.async_create_task(
+        scheduler.async_run(PRIORITY_REFRESH, lambda: request("first"))
+    )
+    await asyncio.sleep(0)
+    refresh = hass.async_create_task(
+        scheduler.async_run(PRIORITY_REFRESH, lambda: request("refresh"))
+    )
+    command = hass.async_create_task(
+        scheduler.async_run(PRIORITY_COMMAND, lambda: request("command"))
+    )
+    await asyncio.sleep(0)
+    assert scheduler.stats.queue_depth == 2
+
+    release.set()
+    assert await asyncio.gather(first, refresh, command) == [
+        "first",
+        "refresh",
+        "command",
+    ]
+    assert started == ["first", "command", "refresh"]
+    assert scheduler.stats.requests == 3
+    assert scheduler.stats.queue_depth == 0
+    assert scheduler.stats.max_queue_depth == 2
+
+
+async def test_rate_limit(hass: HomeAssistant) -> None:
+    """Test requests beyond the burst wait for the bucket to refill."""
+    scheduler = RequestScheduler(hass, rate=20, burst=1, max_concurrent=4)
+
+    async def request() -> None:
+        """Return right away."""
+
+    await asyncio.gather(
+        scheduler.async_run(PRIORITY_REFRESH, request),
+        scheduler.async_run(PRIORITY_REFRESH, request),
+    )
+
+    assert scheduler.stats.queued_requests == 1
+    assert scheduler.stats.max_wait >= 0.04
@@ -33,6 +33,19 @@ async def test_sensor_entities(
     assert comfort_temp_state.attributes["unit_of_measurement"] == "°C"
     assert comfort_temp_state.attributes["device_class"] == "temperature"
 
+    # Test diagnostic sensors
+    frost_temp_state = hass.states.get(
+        "sensor.living_room_frost_protection_temperature"
+    )
+    assert frost_temp_state
+    assert frost_temp_state.state == "5.0"
+    boost_floor_state = hass.states.get("sensor.living_room_boost_floor_temperature")
+    assert boost_floor_state
+    assert boost_floor_state.state == "27.0"
+    error_code_state = hass.states.get("sensor.living_room_error_code")
+    assert error_code_state
+    assert error_code_state.state == "0"
+
 
 async def test_sensor_unavailable_when_offline(
     hass: HomeAssistant, mock_config_entry, mock_pentair_client, mock_thermostat_offline
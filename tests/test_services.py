@@ -0,0 +1,64 @@
+"""Test the Pentair Thermal WiFi services."""
+from unittest.mock import patch
+
+import pytest
+from pypentairthermalwifi import APIError
+
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.pentairthermalwifi.const import DOMAIN
+from custom_components.pentairthermalwifi.services import (
+    ATTR_GROUP_ID,
+    ATTR_SERIAL_NUMBERS,
+    SERVICE_SET_GROUP,
+)
+
+
+async def test_set_group(
+    hass: HomeAssistant, mock_config_entry, mock_pentair_client
+) -> None:
+    """Test a group is updated with one reconciliation and a report."""
+    mock_config_entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.pentairthermalwifi.AsyncPentairThermalWifi",
+        return_value=mock_pentair_client,
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_GROUP,
+        {ATTR_GROUP_ID: 1, ATTR_TEMPERATURE: 23},
+        blocking=True,
+        return_response=True,
+    )
+
+    mock_pentair_client.set_manual_temperature.assert_called_once_with("1234567", 23)
+    # Setup and the reconciliation after the commands
+    assert mock_pentair_client.get_thermostats.call_count == 2
+    assert response["thermostats"]["1234567"]["success"] is True
+    assert response["thermostats"]["1234567"]["latency"] >= 0
+
+    mock_pentair_client.set_manual_temperature.side_effect = APIError("API Error")
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_GROUP,
+        {ATTR_SERIAL_NUMBERS: ["1234567"], ATTR_TEMPERATURE: 24},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["thermostats"]["1234567"]["success"] is False
+    assert response["thermostats"]["1234567"]["error"] == "API Error"
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_GROUP,
+            {ATTR_GROUP_ID: 2, ATTR_TEMPERATURE: 23},
+            blocking=True,
+            return_response=True,
+        )
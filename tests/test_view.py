@@ -0,0 +1,63 @@
+"""Test the Pentair Thermal WiFi thermostat view."""
+from copy import deepcopy
+from dataclasses import replace
+
+from pypentairthermalwifi import RegulationMode
+
+from homeassistant.components.climate import PRESET_BOOST, HVACAction, HVACMode
+from homeassistant.core import HomeAssistant
+
+from custom_components.pentairthermalwifi.coordinator import (
+    PentairThermalWiFiCoordinator,
+)
+from custom_components.pentairthermalwifi.view import ThermostatView
+
+
+def test_view_from_thermostat(mock_thermostat) -> None:
+    """Test the view holds the converted entity state."""
+    view = ThermostatView.from_thermostat(mock_thermostat)
+
+    assert view.current_temperature == 21.5
+    assert view.target_temperature == 21.0
+    assert view.hvac_mode == HVACMode.HEAT
+    assert view.hvac_action == HVACAction.HEATING
+    assert view.preset_mode is None
+    assert not hasattr(view, "__dict__")
+
+    view = ThermostatView.from_thermostat(
+        replace(mock_thermostat, regulation_mode=RegulationMode.BOOST)
+    )
+    assert view.target_temperature == 25.0
+    assert view.preset_mode == PRESET_BOOST
+
+    view = ThermostatView.from_thermostat(replace(mock_thermostat, regulation_mode=4))
+    assert view.hvac_mode == HVACMode.OFF
+    assert view.target_temperature == 21.0
+
+
+async def test_coordinator_builds_views(
+    hass: HomeAssistant, mock_pentair_client, mock_thermostat
+) -> None:
+    """Test views are built once per thermostat change."""
+    coordinator = PentairThermalWiFiCoordinator(hass, mock_pentair_client)
+    await coordinator.async_refresh()
+    view = coordinator.get_view("1234567")
+
+    # An unchanged thermostat keeps its view
+    mock_pentair_client.get_thermostats.return_value = deepcopy(coordinator.data)
+    await coordinator.async_refresh()
+    assert coordinator.get_view("1234567") is view
+
+    coordinator.async_set_thermostat(
+        replace(mock_thermostat, regulation_mode=RegulationMode.OFF)
+    )
+    assert coordinator.get_view("1234567").hvac_action == HVACAction.OFF
+    assert coordinator.get_view("unknown") is None
+
+    # A mode the library does not know does not fail the refresh
+    mock_pentair_client.get_thermostats.return_value.groups[0].thermostats = [
+        replace(mock_thermostat, regulation_mode=4)
+    ]
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.get_view("1234567").hvac_mode == HVACMode.OFF